@@ -1,24 +1,150 @@
 import pygame
 import os
+from config import LANE_WIDTH
+
+# --- Registro central de imágenes ---
+# Cada imagen se lee del disco, se convierte al formato de la pantalla y se escala una
+# sola vez por proceso. Las imágenes pequeñas se copian a un atlas compartido y se
+# entregan como subsuperficies; reiniciar una partida o volver a abrir un menú no lee el disco.
+IMG_FOLDER = "IMG_FOLDER"
+SPRITE_SIZE = (LANE_WIDTH - 20, 60)  # Tamaño en pantalla de jugadores, rivales y obstáculos
+ATLAS_SIZE = (512, 512)
+ATLAS_MAX_SIDE = 256  # Las imágenes más grandes (fondos, memes) se guardan sueltas
+ATLAS_PADDING = 1  # Separación entre imágenes del atlas para que no se mezclen al escalar
+
+
+class TextureAtlas:
+    """Superficie compartida donde se empaquetan imágenes pequeñas por filas (estantes)."""
+    def __init__(self, size=ATLAS_SIZE):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert_alpha()
+        self.width, self.height = size
+        self.x = self.y = 0
+        self.row_height = 0
+        self.used_pixels = 0
+
+    def pack(self, image):
+        """Copia image al atlas y devuelve su subsuperficie, o None si no cabe."""
+        w, h = image.get_size()
+        if self.x + w > self.width:
+            # Nueva fila debajo de la más alta de la fila actual
+            self.x = 0
+            self.y += self.row_height + ATLAS_PADDING
+            self.row_height = 0
+        if w > self.width or self.y + h > self.height:
+            return None
+        rect = pygame.Rect(self.x, self.y, w, h)
+        self.surface.blit(image, rect)
+        self.x += w + ATLAS_PADDING
+        self.row_height = max(self.row_height, h)
+        self.used_pixels += w * h
+        return self.surface.subsurface(rect)
+
+
+class AssetRegistry:
+    """
+    Registro de imágenes cargadas una vez por proceso.
+    La clave es (ruta, tamaño o escala, alfa); el original a tamaño completo no se guarda.
+    """
+    def __init__(self):
+        self.assets = {}  # clave -> superficie (suelta o subsuperficie del atlas)
+        self.atlas = None
+        self.disk_loads = 0
+
+    @staticmethod
+    def _key(path, size=None, scale=None, alpha=True):
+        return (os.path.normpath(path), tuple(size) if size else None, scale, alpha)
+
+    def decode(self, path):
+        """Lee y decodifica la imagen del disco (no necesita la pantalla)."""
+        self.disk_loads += 1
+        return pygame.image.load(path)
+
+    def add(self, image, path, size=None, scale=None, alpha=True):
+        """Convierte, escala y guarda una imagen ya decodificada; devuelve la superficie registrada."""
+        key = self._key(path, size, scale, alpha)
+        if key in self.assets:
+            return self.assets[key]
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha() if alpha else image.convert()
+        if scale is not None:
+            size = (round(image.get_width() * scale[0]), round(image.get_height() * scale[1]))
+        if size is not None and tuple(size) != image.get_size():
+            image = pygame.transform.scale(image, size)
+        if alpha and max(image.get_size()) <= ATLAS_MAX_SIDE:
+            if self.atlas is None:
+                self.atlas = TextureAtlas()
+            packed = self.atlas.pack(image)
+            if packed is not None:
+                image = packed
+        self.assets[key] = image
+        return image
+
+    def image(self, path, size=None, scale=None, alpha=True):
+        """
+        Devuelve la imagen registrada, cargándola del disco solo la primera vez.
+        Argumentos:
+            path: Ruta del archivo.
+            size: Tamaño final (ancho, alto), o None para el tamaño original.
+            scale: Alternativa a size: factores (x, y) sobre el tamaño original.
+            alpha: Conserva la transparencia (convert_alpha) o no (convert, para fondos).
+        """
+        surface = self.assets.get(self._key(path, size, scale, alpha))
+        if surface is None:
+            surface = self.add(self.decode(path), path, size, scale, alpha)
+        return surface
+
+    def has(self, path, size=None, scale=None, alpha=True):
+        return self._key(path, size, scale, alpha) in self.assets
+
+    def memory_report(self):
+        """Memoria de píxeles por imagen registrada (las del atlas comparten su superficie)."""
+        rows = []
+        for (path, size, scale, alpha), surface in self.assets.items():
+            w, h = surface.get_size()
+            rows.append({
+                'asset': path,
+                'tamaño': (w, h),
+                'bytes': w * h * surface.get_bytesize(),
+                'atlas': surface.get_parent() is not None,
+            })
+        return rows
+
+    def print_memory_report(self):
+        rows = self.memory_report()
+        for row in sorted(rows, key=lambda r: -r['bytes']):
+            where = 'atlas' if row['atlas'] else 'suelta'
+            print(f"  {row['asset']:<40} {row['tamaño'][0]:>5}x{row['tamaño'][1]:<5} "
+                  f"{row['bytes'] / 1024:9.1f} KB  {where}")
+        loose = sum(r['bytes'] for r in rows if not r['atlas'])
+        atlas = self.atlas.width * self.atlas.height * self.atlas.surface.get_bytesize() if self.atlas else 0
+        used = self.atlas.used_pixels / (self.atlas.width * self.atlas.height) if self.atlas else 0
+        print(f"Imágenes: {len(rows)}, sueltas {loose / 1024 / 1024:.1f} MB, "
+              f"atlas {atlas / 1024 / 1024:.1f} MB ({used:.0%} ocupado), lecturas de disco: {self.disk_loads}")
+
+
+registry = AssetRegistry()
+
 
 def load_images():
     """
-    Carga las imágenes estáticas del juego (enemigos y obstáculos).
+    Carga las imágenes estáticas del juego (enemigos y obstáculos), ya escaladas al
+    tamaño de los sprites. Desde la segunda llamada salen del registro sin leer el disco.
     Las skins de los jugadores se manejan en SkinManager.
     """
+    enemy_path = os.path.join(IMG_FOLDER, "enemy_img.png")  # Corregido a "enemy_img.png"
+    obstacle_path = os.path.join(IMG_FOLDER, "obstaculo.png")
     try:
-        enemy_path = os.path.join("IMG_FOLDER", "enemy_img.png")  # Corregido a "enemy_img.png"
-        obstacle_path = os.path.join("IMG_FOLDER", "obstaculo.png")
-        print(f"Loading enemy image from: {os.path.abspath(enemy_path)}")
-        print(f"Loading obstacle image from: {os.path.abspath(obstacle_path)}")
-        if not os.path.exists(enemy_path):
-            print(f"Enemy image not found: {enemy_path}")
-        if not os.path.exists(obstacle_path):
-            print(f"Obstacle image not found: {obstacle_path}")
-        ENEMY_IMG = pygame.image.load(enemy_path).convert_alpha()
-        OBSTACLE_IMG = pygame.image.load(obstacle_path).convert_alpha()
-        print(f"Enemy image size: {ENEMY_IMG.get_size()}")
-        print(f"Obstacle image size: {OBSTACLE_IMG.get_size()}")
+        if not registry.has(enemy_path, SPRITE_SIZE) or not registry.has(obstacle_path, SPRITE_SIZE):
+            print(f"Loading enemy image from: {os.path.abspath(enemy_path)}")
+            print(f"Loading obstacle image from: {os.path.abspath(obstacle_path)}")
+            if not os.path.exists(enemy_path):
+                print(f"Enemy image not found: {enemy_path}")
+            if not os.path.exists(obstacle_path):
+                print(f"Obstacle image not found: {obstacle_path}")
+        ENEMY_IMG = registry.image(enemy_path, SPRITE_SIZE)
+        OBSTACLE_IMG = registry.image(obstacle_path, SPRITE_SIZE)
     except Exception as e:
         print(f"Error cargando imágenes: {e}")
         # Imágenes de respaldo
@@ -27,4 +153,9 @@ def load_images():
         OBSTACLE_IMG = pygame.Surface((50, 80), pygame.SRCALPHA)
         pygame.draw.rect(OBSTACLE_IMG, (100, 100, 100), (10, 0, 30, 80))
         print(f"Using fallback images. Enemy size: {ENEMY_IMG.get_size()}, Obstacle size: {OBSTACLE_IMG.get_size()}")
-    return ENEMY_IMG, OBSTACLE_IMG
\ No newline at end of file
+    return ENEMY_IMG, OBSTACLE_IMG
+
+
+def load_background(size):
+    """Fondo de los menús y de la pausa (fondo.png sin transparencia), cargado una sola vez."""
+    return registry.image(os.path.join(IMG_FOLDER, "fondo.png"), size, alpha=False)
@@ -0,0 +1,90 @@
+# cache_audio.py
+# Caché en disco de audio ya decodificado.
+# Cada MP3 se decodifica una sola vez al formato nativo del mixer (frecuencia, tamaño de
+# muestra y canales) y se guarda como PCM crudo en AUDIO_CACHE_DIR. Las cargas siguientes
+# leen ese archivo con mmap y crean el Sound desde el buffer, sin pasar por el códec.
+# La clave es el hash del contenido del MP3 más la configuración del mixer, así que si el
+# archivo cambia o el mixer se abre con otros parámetros se genera una entrada nueva.
+import hashlib
+import json
+import mmap
+import os
+import threading
+import pygame
+import config
+
+INDEX_FILE = 'indice.json'  # ruta|mtime|tamaño -> hash del contenido (evita volver a leer el MP3)
+
+_lock = threading.Lock()  # La precarga usa varios hilos
+_index = None
+stats = {'hits': 0, 'misses': 0}
+
+
+def _index_path():
+    return os.path.join(config.AUDIO_CACHE_DIR, INDEX_FILE)
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        try:
+            with open(_index_path(), 'r', encoding='utf-8') as f:
+                _index = json.load(f)
+        except (OSError, ValueError):
+            _index = {}
+    return _index
+
+
+def _save_index():
+    os.makedirs(config.AUDIO_CACHE_DIR, exist_ok=True)
+    temp_path = _index_path() + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(_index, f)
+    os.replace(temp_path, _index_path())
+
+
+def _content_hash(path):
+    """Hash del MP3; solo se recalcula si cambia su fecha de modificación o su tamaño."""
+    st = os.stat(path)
+    entry = f"{os.path.normpath(path)}|{st.st_mtime_ns}|{st.st_size}"
+    with _lock:
+        digest = _load_index().get(entry)
+    if digest is None:
+        sha = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha.update(block)
+        digest = sha.hexdigest()
+        with _lock:
+            _load_index()[entry] = digest
+            _save_index()
+    return digest
+
+
+def cache_path(path):
+    """Archivo PCM de la caché para path con la configuración actual del mixer."""
+    frequency, size, channels = pygame.mixer.get_init()
+    return os.path.join(config.AUDIO_CACHE_DIR, f"{_content_hash(path)}_{frequency}_{size}_{channels}.pcm")
+
+
+def load_sound(path):
+    """
+    Devuelve un pygame.mixer.Sound de path usando la caché PCM.
+    La primera vez decodifica el MP3 y guarda las muestras; después solo copia el buffer.
+    """
+    if not config.AUDIO_CACHE:
+        return pygame.mixer.Sound(path)
+    os.makedirs(config.AUDIO_CACHE_DIR, exist_ok=True)
+    pcm_path = cache_path(path)
+    if os.path.exists(pcm_path) and os.path.getsize(pcm_path) > 0:
+        stats['hits'] += 1
+        with open(pcm_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return pygame.mixer.Sound(buffer=data)
+    stats['misses'] += 1
+    sound = pygame.mixer.Sound(path)
+    # Escritura atómica: otro hilo o una sesión interrumpida nunca ve un archivo a medias
+    temp_path = f"{pcm_path}.{threading.get_ident()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(sound.get_raw())
+    os.replace(temp_path, pcm_path)
+    return sound
@@ -1,38 +1,171 @@
 import pygame
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import config
+import cache_audio
+
+# Sound effects used by the game and the channel category each one plays on
+SOUND_MANIFEST = {
+    'explosion_sound.mp3': 'explosiones',
+    'thunder_sound.mp3': 'clima',
+}
+DEFAULT_CATEGORY = 'ui'
+# Background music tracks, decoded once into the PCM cache (cache_audio)
+MUSIC_TRACKS = [
+    os.path.join('CANCIONES', 'menu_music.mp3'),
+    os.path.join('CANCIONES', 'game_music.mp3'),
+    os.path.join('FOLDER_CREDITOS', 'credit_music.mp3'),
+]
+
 
 class ManejoMusica:
     def __init__(self):
         pygame.mixer.init()
         self.current_music = None
         self.sounds = {}
+        self.decode_times = {}  # sound_file -> seconds spent decoding it
+        self._reserve_channels(config.SFX_CHANNELS)
+        # Music: tracks are loaded on a worker thread and crossfaded between two channels
+        self.music_tracks = OrderedDict()  # path -> Sound, most recently used last
+        self.music_channel = None
+        self._music_lock = threading.Lock()
+        self._music_request = 0
+        self._music_worker = ThreadPoolExecutor(max_workers=1)
+
+    def _reserve_channels(self, categories):
+        """Reserve a fixed group of mixer channels for each sound category."""
+        total = sum(categories.values()) + 2  # Plus two music channels for crossfades
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), total))
+        pygame.mixer.set_reserved(total)  # Sound.play() without a channel never takes these
+        self.music_channels = [pygame.mixer.Channel(total - 2), pygame.mixer.Channel(total - 1)]
+        self.channels = {}
+        self.channel_started = {}  # Channel -> ticks when its current voice started
+        self.sfx_stats = {}
+        next_id = 0
+        for category, count in categories.items():
+            self.channels[category] = [pygame.mixer.Channel(i) for i in range(next_id, next_id + count)]
+            self.sfx_stats[category] = {'plays': 0, 'stolen': 0, 'max_voices': 0}
+            next_id += count
+
+    def preload_sounds(self, manifest=SOUND_MANIFEST):
+        """Decode every sound of the manifest now so no effect is decoded during play."""
+        for sound_file in manifest:
+            if sound_file not in self.sounds:
+                try:
+                    self.add_sound(sound_file, self.load_sound(sound_file))
+                except Exception as e:
+                    print(f"Error preloading sound {sound_file}: {e}")
+
+    def play_game(self, music_file, folder='CANCIONES', volume=1.0):
+        """
+        Switch the background music without blocking the caller.
+        The track is loaded (from the PCM cache) on the music worker thread and then
+        crossfaded with the current one; the calling frame only queues the request.
+        """
+        if self.current_music == music_file:
+            return
+        self.current_music = music_file
+        with self._music_lock:
+            self._music_request += 1
+            request = self._music_request
+        self._music_worker.submit(self._switch_music, request, os.path.join(folder, music_file), volume)
 
-    def play_game(self, music_file):
-        """Play background music."""
+    def prepare_music(self, music_file, folder='CANCIONES'):
+        """Load a track ahead of time so the next play_game of it starts without I/O."""
+        self._music_worker.submit(self._music_track, os.path.join(folder, music_file))
+
+    def _music_track(self, path):
+        """
+        Loaded Sound of a track, keeping the last MUSIC_TRACK_CACHE tracks in memory.
+        Tracks are fully decoded PCM (about 10 MB per minute), not streamed; a track that is
+        evicted while still fading out stays alive until its channel releases it.
+        """
+        with self._music_lock:
+            sound = self.music_tracks.get(path)
+            if sound is not None:
+                self.music_tracks.move_to_end(path)
+                return sound
         try:
-            if self.current_music != music_file:
-                pygame.mixer.music.stop()
-                music_path = os.path.join('CANCIONES', music_file)  # Adjust path as needed
-                pygame.mixer.music.load(music_path)
-                pygame.mixer.music.play(-1)  # Loop indefinitely
-                self.current_music = music_file
+            sound = cache_audio.load_sound(path)
         except Exception as e:
-            print(f"Error playing music {music_file}: {e}")
+            print(f"Error loading music {path}: {e}")
+            return None
+        with self._music_lock:
+            self.music_tracks[path] = sound
+            while len(self.music_tracks) > config.MUSIC_TRACK_CACHE:
+                self.music_tracks.popitem(last=False)
+        return sound
+
+    def _switch_music(self, request, path, volume):
+        """Runs on the music worker: fade the current track out and the new one in."""
+        sound = self._music_track(path)
+        with self._music_lock:
+            if request != self._music_request:
+                return  # A newer switch was requested while this track was loading
+            previous = self.music_channel
+            channel = self.music_channels[1] if previous is self.music_channels[0] else self.music_channels[0]
+            fade = config.MUSIC_CROSSFADE_MS
+            if previous is not None:
+                previous.fadeout(fade)
+            self.music_channel = None
+            if sound is None:
+                return
+            channel.stop()
+            channel.set_volume(volume)
+            channel.play(sound, loops=-1, fade_ms=fade)  # Loop indefinitely
+            self.music_channel = channel
+
+    def load_sound(self, sound_file):
+        """Decode a sound effect (safe to call from a preload worker thread)."""
+        start = time.perf_counter()
+        sound = cache_audio.load_sound(os.path.join('CANCIONES', sound_file))  # PCM cached on disk after the first decode
+        self.decode_times[sound_file] = time.perf_counter() - start
+        return sound
+
+    def add_sound(self, sound_file, sound):
+        """Register an already decoded sound so play_sound does not load it on first use."""
+        self.sounds.setdefault(sound_file, sound)
 
     def play_sound(self, sound_file, loop=False):
-        """Play a sound effect, with optional looping."""
+        """Play a sound effect, with optional looping, on a channel of its category."""
         try:
             if sound_file not in self.sounds:
-                sound_path = os.path.join('CANCIONES', sound_file)  # Adjust path as needed
-                self.sounds[sound_file] = pygame.mixer.Sound(sound_path)
-            sound = self.sounds[sound_file]
-            if loop:
-                sound.play(loops=-1)  # Loop indefinitely
-            else:
-                sound.play()
+                print(f"Sound {sound_file} was not preloaded; decoding it now")
+                self.sounds[sound_file] = self.load_sound(sound_file)
+            channel = self._voice(SOUND_MANIFEST.get(sound_file, DEFAULT_CATEGORY))
+            channel.play(self.sounds[sound_file], loops=-1 if loop else 0)
+            self.channel_started[channel] = pygame.time.get_ticks()
         except Exception as e:
             print(f"Error playing sound {sound_file}: {e}")
 
+    def _voice(self, category):
+        """Free channel of the category, or the one playing the oldest voice (voice stealing)."""
+        channels = self.channels.get(category) or self.channels[DEFAULT_CATEGORY]
+        stats = self.sfx_stats[category if category in self.channels else DEFAULT_CATEGORY]
+        stats['plays'] += 1
+        busy = [channel for channel in channels if channel.get_busy()]
+        stats['max_voices'] = max(stats['max_voices'], min(len(busy) + 1, len(channels)))
+        for channel in channels:
+            if not channel.get_busy():
+                return channel
+        stats['stolen'] += 1  # Every channel of the category is busy (saturated)
+        oldest = min(channels, key=lambda channel: self.channel_started.get(channel, 0))
+        oldest.stop()
+        return oldest
+
+    def sfx_report(self):
+        """Decode time per sound and, per category, plays, saturation and stolen voices."""
+        return {
+            'decode_ms': {name: round(seconds * 1000, 1) for name, seconds in self.decode_times.items()},
+            'categorias': {
+                category: dict(stats, saturation=stats['stolen'] / stats['plays'] if stats['plays'] else 0)
+                for category, stats in self.sfx_stats.items()
+            },
+        }
+
     def stop_sound(self, sound_file):
         """Stop a specific sound effect."""
         try:
@@ -43,8 +176,16 @@ class ManejoMusica:
 
     def limpieza(self):
         """Clean up music and sounds."""
-        pygame.mixer.music.stop()
+        with self._music_lock:
+            self._music_request += 1  # Discards any pending music switch
+            for channel in self.music_channels:
+                channel.stop()
+            self.music_channel = None
+            self.music_tracks.clear()
         for sound in self.sounds.values():
             sound.stop()
+        for channels in self.channels.values():
+            for channel in channels:
+                channel.stop()
         self.sounds.clear()
         self.current_music = None
\ No newline at end of file
@@ -0,0 +1,172 @@
+# catalogo.py
+# Modelo único de la tienda: catálogo de skins, cuáles están desbloqueadas y puntos.
+# store_data.json (y su diario de transacciones) se lee una sola vez por proceso;
+# StoreManager y SkinManager consultan este modelo en vez de leer el archivo cada uno.
+# Los cambios se anuncian a quien se suscriba, para que cada menú o caché actualice solo
+# lo que le afecta:
+#   ('points', puntos)                       -> nuevo total de puntos
+#   ('unlocked', (num, preview, game, ...))  -> skin recién comprada
+import json
+import os
+import threading
+from diario_tienda import StoreJournal
+
+STORE_FOLDER = "STORE_FOLDER"
+STORE_DATA_FILE = os.path.join(STORE_FOLDER, "store_data.json")
+
+DEFAULT_SKINS = [
+    (1, "skin_store1.png", "skin_store1.png", 0, True),
+    (2, "skin_store2.png", "skin_store2.png", 0, True),
+    (3, "skin_store3.png", "skin_store3.png", 500, False),
+    (4, "skin_store4.png", "skin_store4.png", 500, False),
+    (5, "skin_store5.png", "skin_store5.png", 500, False)
+]
+
+
+class StoreCatalog:
+    """
+    Estado de la tienda en memoria: skins (num, preview, game, cost, unlocked) y puntos.
+    Cada cambio se registra en el diario (escritura en segundo plano) y se notifica.
+    """
+    def __init__(self, path=STORE_DATA_FILE):
+        self.path = path
+        self.points = 0
+        self.skins = []
+        self.repaired = False  # Instantánea o diario dañados al cargar; hay que reescribir la instantánea
+        self._listeners = []
+        self._lock = threading.Lock()  # El hilo del diario lee el estado para las instantáneas
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.journal = StoreJournal(path, self.snapshot)
+        self._load()
+
+    def _read_snapshot(self):
+        """Lee y valida la instantánea. Returns: (puntos, skins, última transacción)."""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            raw_content = f.read()
+        # Verificar si contiene texto ruso/corrupto
+        if "Какой" in raw_content or "этаж" in raw_content:
+            raise ValueError("Archivo corrupto - Contiene texto en ruso")
+        data = json.loads(raw_content)
+        if not isinstance(data, dict):
+            raise ValueError("El archivo JSON no contiene un objeto válido")
+        points = data.get('points', 0)
+        if not isinstance(points, (int, float)):
+            raise ValueError("Los puntos deben ser numéricos")
+        skins = data.get('skins', [])
+        if not isinstance(skins, list):
+            raise ValueError("Las skins deben estar en una lista")
+        validated_skins = []
+        for skin in skins:
+            if isinstance(skin, list) and len(skin) == 5 and isinstance(skin[4], bool):
+                validated_skins.append(tuple(skin))
+            else:
+                print(f"Skin inválida ignorada: {skin}")
+                self.repaired = True
+        return points, validated_skins, data.get('seq', 0)
+
+    def _load(self):
+        snapshot_seq = 0
+        try:
+            if os.path.exists(self.path):
+                self.points, self.skins, snapshot_seq = self._read_snapshot()
+                if not self.skins:
+                    self.skins = list(DEFAULT_SKINS)
+                    self.repaired = True
+            else:
+                print("Creando datos de tienda por defecto")
+                self.skins = list(DEFAULT_SKINS)
+                self.repaired = True
+        except Exception as e:
+            print(f"ERROR cargando datos de tienda: {e}")
+            print("Usando datos por defecto")
+            self.points, self.skins = 0, list(DEFAULT_SKINS)
+            self.repaired = True
+
+        # Recuperación: transacciones del diario que no llegaron a la instantánea
+        records = self.journal.recover(snapshot_seq)
+        for record in records:
+            self._apply(record)
+        if records:
+            print(f"Tienda: {len(records)} transacciones recuperadas del diario")
+        if self.journal.discarded:
+            self.repaired = True  # Dejar el estado recuperado en la instantánea y el diario limpio
+        print(f"Tienda cargada: {self.points} puntos, "
+              f"{len(self.unlocked())}/{len(self.skins)} skins desbloqueadas")
+
+    # --- Consultas ---
+    def unlocked(self):
+        """Skins desbloqueadas como (num, preview, game), ordenadas por número."""
+        return sorted((num, preview, game) for num, preview, game, _, unlocked in self.skins if unlocked)
+
+    def get(self, skin_num):
+        for skin in self.skins:
+            if skin[0] == skin_num:
+                return skin
+        return None
+
+    def snapshot(self):
+        """Estado completo para la instantánea, con el número de la última transacción."""
+        with self._lock:
+            return {
+                'points': self.points,
+                'skins': [list(skin) for skin in self.skins],
+                'seq': self.journal.seq
+            }
+
+    # --- Cambios ---
+    def subscribe(self, callback):
+        """callback(evento, dato) se llama tras cada cambio (ver cabecera del módulo)."""
+        self._listeners.append(callback)
+
+    def _notify(self, event, data):
+        for callback in self._listeners:
+            try:
+                callback(event, data)
+            except Exception as e:
+                print(f"Error notificando cambio de tienda ({event}): {e}")
+
+    def _apply(self, record):
+        """Aplica una transacción del diario al estado en memoria."""
+        if record['op'] == 'points':
+            self.points += record['amount']
+        elif record['op'] == 'purchase':
+            for i, (num, preview, game, cost, unlocked) in enumerate(self.skins):
+                if num == record['skin']:
+                    self.skins[i] = (num, preview, game, cost, True)
+                    self.points -= record['cost']
+                    break
+
+    def _commit(self, record):
+        # Cambia el estado y registra la transacción; el diario la escribe en segundo plano
+        with self._lock:
+            self._apply(record)
+            self.journal.append(record)
+
+    def add_points(self, points):
+        self._commit({'op': 'points', 'amount': points})
+        self._notify('points', self.points)
+
+    def purchase(self, skin_num):
+        """Compra la skin si está bloqueada y alcanzan los puntos. Returns: True si se compró."""
+        skin = self.get(skin_num)
+        if skin is None or skin[4] or self.points < skin[3]:
+            return False
+        self._commit({'op': 'purchase', 'skin': skin_num, 'cost': skin[3]})
+        self._notify('unlocked', self.get(skin_num))
+        self._notify('points', self.points)
+        return True
+
+    def save(self):
+        """Guarda la instantánea completa ahora y vacía el diario."""
+        self.journal.compact()
+
+
+_catalog = None
+
+
+def get_catalog():
+    """Catálogo compartido; se carga la primera vez que se pide."""
+    global _catalog
+    if _catalog is None:
+        _catalog = StoreCatalog()
+    return _catalog
@@ -8,8 +8,14 @@ LANES = 6
 LANE_WIDTH = WIDTH // LANES
 FPS = 60
 LIVES = 3
+INVINCIBLE_FRAMES = 90  # Frames de invencibilidad tras un choque
+BLINK_PERIOD = 10  # Frames de cada ciclo de parpadeo durante la invencibilidad
+BLINK_VISIBLE_FRAMES = 5  # Frames visibles al inicio de cada ciclo de parpadeo
+DIRTY_RECT_RENDERING = False  # Envía a pantalla solo las zonas que cambiaron (si el clima lo permite)
 SCORES_FILE = 'highscores.json'
-TOP_SCORES = 5
+TOP_SCORES = 5  # Puntuaciones que guarda la tabla de récords (y highscores.json)
+TOP_SCORES_SHOWN = 5  # Récords que se muestran y que piden iniciales al terminar
+SCORE_DATABASE = None  # Base SQLite con el historial de todas las partidas (p. ej. 'historial.db'); None la desactiva
 
 # --- Configuración de Niveles ---
 #TODO: Configurar parámetros dinámicos para niveles
@@ -29,6 +35,29 @@ MAX_OBSTACLES = 4
 #TODO: Definir climas disponibles y el clima por defecto
 AVAILABLE_WEATHERS = ['lluvioso', 'nevado', 'noche']
 CURRENT_WEATHER = 'lluvioso'  # Clima por defecto
+RAIN_PARTICLES = 50  # Gotas de lluvia en pantalla (admite miles)
+SNOW_PARTICLES = 50  # Copos de nieve en pantalla (admite miles)
+SUNRISE_STARS = 60  # Estrellas fugaces del amanecer (admite miles)
+LIGHTNING_MIN_INTERVAL = 120  # Frames mínimos entre relámpagos (2 segundos a 60 FPS)
+LIGHTNING_MAX_INTERVAL = 600  # Frames máximos entre relámpagos (10 segundos a 60 FPS)
+LIGHTNING_FLASH_FRAMES = 10  # Duración del destello en frames
+LIGHTNING_FLASH_ALPHA = 100  # Intensidad máxima del destello (0-255)
+SCROLLING_ROAD = False  # Marcas de carril discontinuas que avanzan a la velocidad del juego
+HUD_STATS = False  # Imprime al terminar la partida cuántas veces se renderizó el HUD
+ASSET_MEMORY_REPORT = False  # Imprime al iniciar la memoria usada por cada imagen del registro
+SKIN_CACHE_STATS = False  # Imprime aciertos y memoria de la caché de skins al abrir el selector
+PRELOAD_WORKERS = 4  # Hilos que decodifican imágenes y sonidos durante la pantalla de carga
+SFX_CHANNELS = {'explosiones': 3, 'clima': 2, 'ui': 1}  # Voces simultáneas por categoría de efecto
+AUDIO_CACHE = True  # Guarda el audio decodificado (PCM) para no decodificar los MP3 en cada carga
+AUDIO_CACHE_DIR = 'CACHE_AUDIO'
+THUMBNAIL_CACHE = True  # Guarda las skins ya escaladas a cada tamaño en que se muestran
+THUMBNAIL_CACHE_DIR = 'CACHE_MINIATURAS'
+MUSIC_CROSSFADE_MS = 800  # Duración del fundido cruzado entre pistas de música
+# Pistas de música decodificadas (PCM) que se mantienen en memoria. La música ya no se lee
+# en streaming: cada pista ocupa unos 10 MB por minuto (44.1 kHz, 16 bits, estéreo). Con 2 caben
+# la música del menú y la de la partida actual, así que volver al menú no decodifica de nuevo.
+MUSIC_TRACK_CACHE = 2
+AUDIO_STATS = False  # Imprime al terminar la partida tiempos de decodificación y saturación de canales
 
 # --- Funciones de Configuración Dinámica ---
 # Calcula la velocidad según el nivel
@@ -59,15 +88,15 @@ def load_scores():
         with open(SCORES_FILE, 'r') as f:
             try:
                 scores = json.load(f)
-                print(f"Puntuaciones cargadas desde el archivo: {scores}")
+                print(f"Puntuaciones cargadas desde el archivo: {len(scores)}")
                 # Maneja formato antiguo (solo números) y nuevo (iniciales y puntuación)
                 if scores and isinstance(scores[0], (int, float)):
                     converted_scores = [('---', score) for score in scores]
-                    print(f"Convertido formato antiguo a: {converted_scores}")
+                    print(f"Convertido formato antiguo: {len(converted_scores)} puntuaciones")
                     return converted_scores
                 else:
                     converted_scores = [(entry['initials'], entry['score']) for entry in scores]
-                    print(f"Formato nuevo cargado: {converted_scores}")
+                    print(f"Formato nuevo cargado: {converted_scores[:TOP_SCORES_SHOWN]}")
                     return converted_scores
             except (json.JSONDecodeError, KeyError, TypeError) as e:
                 print(f"Error al cargar highscores.json: {e}. Inicializando como lista vacía.")
@@ -84,20 +113,80 @@ def save_scores(scores):
             for initials, score in scores
             if isinstance(initials, str) and isinstance(score, (int, float))
         ]
-        with open(SCORES_FILE, 'w') as f:
+        # Escribe en un temporal y lo renombra: el archivo nunca queda a medio escribir
+        temp_path = SCORES_FILE + '.tmp'
+        with open(temp_path, 'w') as f:
             json.dump(formatted_scores, f, indent=4)
-        print(f"Puntuaciones guardadas en el archivo: {formatted_scores}")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, SCORES_FILE)
+        print(f"Puntuaciones guardadas en el archivo: {len(formatted_scores)}")
     except Exception as e:
         print(f"Error al guardar las puntuaciones en highscores.json: {e}")
 
+# Las puntuaciones viven en memoria (puntuaciones.Leaderboard) y se guardan en segundo plano
 #TODO: Añadir nueva puntuación a la lista de récords
-def add_score(initials, score):
+def add_score(initials, score, run_id=None):
+    from puntuaciones import leaderboard
+    from historial import get_history
     try:
-        scores = load_scores()
-        scores.append((initials.upper(), score))
-        scores.sort(key=lambda x: x[1], reverse=True)
-        scores = scores[:TOP_SCORES]
-        save_scores(scores)
-        print(f"Nueva puntuación añadida: {initials}, {score}. Lista actual: {scores}")
+        leaderboard.add(initials, score)
+        history = get_history()
+        if history and run_id is not None:
+            history.set_initials(run_id, initials.upper())
+        print(f"Nueva puntuación añadida: {initials}, {score}. Mejores: {leaderboard.top(TOP_SCORES_SHOWN)}")
     except Exception as e:
-        print(f"Error al añadir la puntuación: {e}")
\ No newline at end of file
+        print(f"Error al añadir la puntuación: {e}")
+
+# Mejores n puntuaciones (todas si n es None) como (iniciales, puntuación)
+def get_top_scores(n=None):
+    from puntuaciones import leaderboard
+    return leaderboard.top(n)
+
+# Indica si la puntuación entraría entre las n mejores (por defecto, las que se muestran)
+def qualifies_for_top(score, n=TOP_SCORES_SHOWN):
+    from puntuaciones import leaderboard
+    return leaderboard.qualifies(score, n)
+
+
+# --- Historial de partidas (SQLite, solo si SCORE_DATABASE está definido) ---
+# Guarda una partida terminada; devuelve su id para añadir las iniciales después, o None
+def record_run(score, level, mode, weather, duration, initials=None):
+    from historial import get_history
+    history = get_history()
+    if history is None:
+        return None
+    try:
+        return history.add_run(score, level, mode, weather, duration, initials)
+    except Exception as e:
+        print(f"Error al guardar la partida en el historial: {e}")
+        return None
+
+# Posición de la puntuación entre todas las partidas y total de partidas, o None sin historial
+def get_score_rank(score):
+    from historial import get_history
+    history = get_history()
+    if history is None:
+        return None
+    return history.rank(score), history.count()
+
+# Porcentaje de partidas con menor puntuación, o None sin historial
+def get_score_percentile(score):
+    from historial import get_history
+    history = get_history()
+    return history.percentile(score) if history else None
+
+# Mejor puntuación de unas iniciales (del historial, o de la tabla de récords si no hay)
+def get_personal_best(initials):
+    from historial import get_history
+    history = get_history()
+    if history:
+        return history.personal_best(initials)
+    scores = [score for name, score in get_top_scores() if name == initials.upper()]
+    return max(scores) if scores else None
+
+# Mejores n partidas jugadas con un clima; sin historial no se sabe el clima de cada récord
+def get_top_scores_by_weather(weather, n=TOP_SCORES_SHOWN):
+    from historial import get_history
+    history = get_history()
+    return history.top(n, weather.strip()) if history else []
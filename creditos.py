@@ -1,18 +1,19 @@
 import pygame
 import pygame_menu
 import os
+from assets import registry  # Las imágenes de créditos se cargan una sola vez
 
-# Inicializa Pygame y el mixer (asegúrate de hacerlo sólo una vez en tu aplicación)
+# Inicializa Pygame (el mixer lo inicializa ManejoMusica)
 pygame.init()
-pygame.mixer.init()
 
-def mostrar_creditos(surface, volver_al_menu_callback, bgfun=None):
+def mostrar_creditos(surface, volver_al_menu_callback, bgfun=None, music_manager=None):
     """
     Muestra la pantalla de créditos con autores, logo y meme usando translate y set_float.
     Recibe:
       - surface: pantalla donde dibujar
       - volver_al_menu_callback: función a ejecutar al pulsar "Regresar"
       - bgfun: función opcional para redibujar el fondo del menú principal
+      - music_manager: ManejoMusica que reproduce la música de créditos
     """
     W, H = surface.get_size()
 
@@ -28,14 +29,9 @@ def mostrar_creditos(surface, volver_al_menu_callback, bgfun=None):
     theme.widget_font_color = (255, 255, 255)
     theme.title_background_color = (50, 20, 100)
 
-    # Carga y reproduce la música de créditos
-    music_path = os.path.join("FOLDER_CREDITOS", "credit_music.mp3")
-    if os.path.exists(music_path):
-        pygame.mixer.music.load(music_path)
-        pygame.mixer.music.set_volume(0.5)
-        pygame.mixer.music.play(-1)
-    else:
-        print(f"[ERROR] Archivo de música no encontrado: {music_path}")
+    # Reproduce la música de créditos con el mismo controlador de música que el resto del juego
+    if music_manager is not None:
+        music_manager.play_game('credit_music.mp3', folder='FOLDER_CREDITOS', volume=0.5)
 
     # Crea el menú de créditos
     menu = pygame_menu.Menu(
@@ -61,24 +57,30 @@ def mostrar_creditos(surface, volver_al_menu_callback, bgfun=None):
     # Logo flotante (si existe)
     logo_path = os.path.join('FOLDER_CREDITOS', 'logo.png')
     if os.path.isfile(logo_path):
-        logo_w = menu.add.image(logo_path, scale=(0.3, 0.3))
+        logo_w = menu.add.surface(registry.image(logo_path, scale=(0.3, 0.3)))
         logo_w.translate(300, -180)
         logo_w.set_float(True)
 
     # Meme flotante (si existe)
     meme_path = os.path.join('FOLDER_CREDITOS', 'brawl.png')
     if os.path.isfile(meme_path):
-        meme_w = menu.add.image(meme_path, scale=(1.2, 1.2))
+        meme_w = menu.add.surface(registry.image(meme_path, scale=(1.2, 1.2)))
         meme_w.translate(0, 20)
         meme_w.set_float(True)
 
     # Botón "Regresar"
-    btn_volver = menu.add.button('Regresar', volver_al_menu_callback)
+    def regresar():
+        if music_manager is not None:
+            music_manager.play_game('menu_music.mp3')  # Vuelve (con fundido) a la música del menú
+        volver_al_menu_callback()
+
+    btn_volver = menu.add.button('Regresar', regresar)
     btn_volver.translate(0, 280)
     btn_volver.set_float(True)
 
     # Ejecuta el menú; pasa bgfun para que tu fondo siga apareciendo
     menu.mainloop(surface, bgfun=bgfun)
 
-    # Al salir, detiene la música de créditos
-    pygame.mixer.music.stop()
+    # Al salir, vuelve a la música del menú (no hace nada si ya suena)
+    if music_manager is not None:
+        music_manager.play_game('menu_music.mp3')
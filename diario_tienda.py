@@ -0,0 +1,137 @@
+# diario_tienda.py
+# Diario de transacciones de la tienda (puntos ganados y compras).
+# Cada cambio se añade como una línea JSON al final de store_journal.log; nunca se
+# reescribe el archivo completo. Un hilo en segundo plano escribe las líneas pendientes
+# por lotes con un solo fsync, así que el fin de partida y la compra no esperan al disco.
+# Cada COMPACT_EVERY transacciones el estado completo se guarda como instantánea
+# (store_data.json, con el número de la última transacción incluida) y el diario se vacía.
+# Al iniciar, la instantánea se completa repitiendo las transacciones posteriores del diario.
+import atexit
+import json
+import os
+import threading
+
+JOURNAL_NAME = "store_journal.log"
+COMPACT_EVERY = 50  # Transacciones entre instantáneas
+
+
+def write_snapshot(path, data):
+    """Escribe data en path de forma atómica (temporal + fsync + renombrado)."""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class StoreJournal:
+    """
+    Diario de solo-añadir con escritura en segundo plano y compactación periódica.
+    snapshot_fn devuelve el estado actual como diccionario serializable; se llama desde
+    el hilo de escritura, así que debe tomar su propio lock.
+    """
+    def __init__(self, snapshot_path, snapshot_fn, compact_every=COMPACT_EVERY):
+        self.snapshot_path = snapshot_path
+        self.journal_path = os.path.join(os.path.dirname(snapshot_path), JOURNAL_NAME)
+        self.snapshot_fn = snapshot_fn
+        self.compact_every = compact_every
+        self.seq = 0  # Número de la última transacción registrada
+        self._pending = []  # Líneas aún no escritas
+        self._since_compact = 0
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()  # Escritura del diario e instantáneas
+        self._writer = None
+        self._file = None
+        self.batches = 0
+        self.discarded = False  # recover() tuvo que descartar una línea cortada
+        atexit.register(self.close)
+
+    def recover(self, snapshot_seq):
+        """
+        Transacciones del diario posteriores a la instantánea, en orden.
+        Una última línea cortada (corte durante la escritura) se descarta y se quita del
+        archivo, para que la siguiente transacción no se escriba pegada a ella.
+        """
+        self.seq = snapshot_seq
+        self.discarded = False
+        records = []
+        if not os.path.exists(self.journal_path):
+            return records
+        end = 0  # Fin de la última línea completa
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("línea sin terminar")
+                    record = json.loads(line)
+                except ValueError:
+                    print("Diario de tienda: línea incompleta descartada")
+                    self.discarded = True
+                    break
+                end += len(line)
+                if record.get('seq', 0) > snapshot_seq:
+                    records.append(record)
+                    self.seq = record['seq']
+        if self.discarded:
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+        return records
+
+    def append(self, record):
+        """Registra una transacción; se escribe en segundo plano. Returns: su número."""
+        with self._cond:
+            self.seq += 1
+            record = dict(record, seq=self.seq)
+            self._pending.append(json.dumps(record) + '\n')
+            self._cond.notify()
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._writer_loop, name='store-journal', daemon=True)
+            self._writer.start()
+        return record['seq']
+
+    def _writer_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+            self.flush()
+
+    def flush(self):
+        """Escribe y sincroniza las transacciones pendientes; compacta si toca."""
+        with self._io_lock:
+            with self._cond:
+                lines, self._pending = self._pending, []
+            if lines:
+                if self._file is None:
+                    self._file = open(self.journal_path, 'a', encoding='utf-8')
+                self._file.write(''.join(lines))
+                self._file.flush()
+                os.fsync(self._file.fileno())  # Un solo fsync por lote
+                self.batches += 1
+                self._since_compact += len(lines)
+            if self._since_compact >= self.compact_every:
+                self._compact()
+
+    def compact(self):
+        """Guarda la instantánea ahora y vacía el diario."""
+        with self._io_lock:
+            self._compact()
+
+    def _compact(self):
+        # La instantánea incluye todas las transacciones escritas (y quizá algunas pendientes,
+        # que al recuperar se saltan por su número), así que ya se puede vaciar el diario
+        write_snapshot(self.snapshot_path, self.snapshot_fn())
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        open(self.journal_path, 'w').close()
+        self._since_compact = 0
+
+    def close(self):
+        """Al salir: escribe lo pendiente y deja el estado en la instantánea."""
+        self.flush()
+        if self._since_compact:
+            self.compact()
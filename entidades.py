@@ -0,0 +1,212 @@
+# entidades.py
+# Almacén de entidades (rivales y obstáculos) en arreglos contiguos de NumPy.
+# En lugar de actualizar un pygame.sprite.Sprite por objeto, todas las entidades
+# avanzan en una sola operación vectorizada; solo las que salen de la pantalla
+# pasan por Python para elegir su nuevo carril. Para dibujar y para el código que
+# espera sprites se ofrecen vistas ligeras (EntitySprite / EntityGroup).
+import random
+import numpy as np
+import pygame
+from config import HEIGHT, LANES, LANE_WIDTH
+from sprites import scaled_image
+
+# Tipos de entidad
+RIVAL = 0
+OBSTACLE = 1
+
+ENTITY_SIZE = (LANE_WIDTH - 20, 60)  # Tamaño de rivales y obstáculos en pantalla
+INITIAL_CAPACITY = 16
+
+
+class EntityStore:
+    """
+    Guarda carril, posición y, velocidad y tipo de cada entidad en arreglos paralelos.
+    Argumentos:
+        lane_manager: LaneManager compartido con el resto del juego.
+        enemy_img, obstacle_img: Imágenes originales; se escalan una sola vez (caché compartida).
+    """
+    def __init__(self, lane_manager, enemy_img, obstacle_img):
+        self.lane_manager = lane_manager
+        self.images = {
+            RIVAL: scaled_image(enemy_img, ENTITY_SIZE),
+            OBSTACLE: scaled_image(obstacle_img, ENTITY_SIZE),
+        }
+        self.width, self.height = ENTITY_SIZE
+        self.count = 0
+        self.counts = {RIVAL: 0, OBSTACLE: 0}
+        self.lane = np.zeros(INITIAL_CAPACITY, dtype=np.int16)
+        self.y = np.zeros(INITIAL_CAPACITY, dtype=np.int32)  # Borde superior (rect.y)
+        self.speed = np.zeros(INITIAL_CAPACITY, dtype=np.float32)
+        self.step = np.zeros(INITIAL_CAPACITY, dtype=np.int32)  # Píxeles por frame (speed redondeada)
+        self.kind = np.zeros(INITIAL_CAPACITY, dtype=np.int8)
+
+    # Duplica la capacidad de los arreglos cuando se llenan
+    def _grow(self):
+        capacity = len(self.lane) * 2
+        for name in ('lane', 'y', 'speed', 'step', 'kind'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    # Posición x (rect.x) de las entidades centradas en su carril
+    def x_of(self, lanes):
+        return lanes * LANE_WIDTH + LANE_WIDTH // 2 - self.width // 2
+
+    def add(self, kind, speed):
+        """Agrega una entidad nueva y devuelve su índice."""
+        if self.count == len(self.lane):
+            self._grow()
+        i = self.count
+        self.count += 1
+        self.counts[kind] += 1
+        self.kind[i] = kind
+        self.speed[i] = speed
+        self.step[i] = int(speed + 0.5)
+        if kind == RIVAL:
+            self.reset(i, LANES // 2)
+        else:
+            # Los obstáculos nuevos aparecen en cualquier carril, justo encima de la pantalla
+            self.lane[i] = self.lane_manager.get_random_lane()
+            self.y[i] = -self.height
+            self._index(i)
+        return i
+
+    def reset(self, i, player_lane):
+        """Reinicia la entidad i en un carril aleatorio por encima de la pantalla."""
+        lane = self.lane_manager.get_random_lane_avoiding(player_lane)
+        self.lane[i] = lane
+        if self.kind[i] == RIVAL:
+            self.lane_manager.occupy_lane(lane, 'enemy')
+            self.y[i] = -self.height - random.randint(0, 100)
+        else:
+            self.y[i] = -self.height
+        self._index(i)
+
+    # Actualiza el índice por carril del LaneManager tras cambiar carril o posición
+    def _index(self, i):
+        self.lane_manager.place_entity(i, int(self.lane[i]), self._y_key)
+
+    def _y_key(self, i):
+        return self.y[i]
+
+    def set_speed(self, speed):
+        """Cambia la velocidad de todas las entidades."""
+        self.speed[:self.count] = speed
+        # Igual que rect.y += speed: pygame redondea el avance de cada frame
+        self.step[:self.count] = int(speed + 0.5)
+
+    def update(self, player_lane):
+        """
+        Avanza todas las entidades un frame y reinicia las que salieron de la pantalla.
+        Returns: Índices de los rivales que salieron (ya reiniciados), en orden.
+        """
+        n = self.count
+        y = self.y[:n]
+        y += self.step[:n]
+        wrapped = np.flatnonzero(y > HEIGHT)
+        if not len(wrapped):
+            return wrapped
+        kinds = self.kind[wrapped]
+        rivals_out = wrapped[kinds == RIVAL]
+        for i in rivals_out.tolist() + wrapped[kinds != RIVAL].tolist():
+            self.lane_manager.free_lane(int(self.lane[i]))
+            self.reset(i, player_lane)
+        return rivals_out
+
+    def collide(self, rect):
+        """
+        Busca entidades que choquen con rect usando el índice por carril del LaneManager:
+        solo se revisan las entidades de los carriles que cubre rect y cerca de su altura.
+        Returns: (índice del primer rival, índice del primer obstáculo), -1 si no hay choque.
+        """
+        rival_hit = obstacle_hit = -1
+        first_lane = max(rect.left // LANE_WIDTH, 0)
+        last_lane = min((rect.right - 1) // LANE_WIDTH, LANES - 1)
+        y, kind, height = self.y, self.kind, self.height
+        for lane in range(first_lane, last_lane + 1):
+            x = self.x_of(lane)
+            if x >= rect.right or x + self.width <= rect.left:
+                continue
+            # Recorre de abajo hacia arriba y se detiene al pasar por encima de rect
+            for i in reversed(self.lane_manager.entities_in_lane(lane)):
+                top = y[i]
+                if top >= rect.bottom:
+                    continue
+                if top + height <= rect.top:
+                    break
+                if kind[i] == RIVAL:
+                    if rival_hit < 0:
+                        rival_hit = i
+                elif obstacle_hit < 0:
+                    obstacle_hit = i
+        return rival_hit, obstacle_hit
+
+    def rect(self, i):
+        """Rectángulo de la entidad i (equivalente al rect de un sprite)."""
+        return pygame.Rect(int(self.x_of(int(self.lane[i]))), int(self.y[i]), self.width, self.height)
+
+    def draw(self, surface, kind=None):
+        """
+        Dibuja las entidades visibles (de un tipo o todas) con un solo surface.blits.
+        Returns: Lista de rectángulos dibujados.
+        """
+        n = self.count
+        visible = (self.y[:n] > -self.height) & (self.y[:n] < HEIGHT)
+        if kind is not None:
+            visible &= self.kind[:n] == kind
+        idx = np.flatnonzero(visible)
+        xs = self.x_of(self.lane[idx].astype(np.int32)).tolist()
+        ys = self.y[idx].tolist()
+        images = self.images
+        kinds = self.kind[idx].tolist()
+        return surface.blits([(images[k], (x, y)) for k, x, y in zip(kinds, xs, ys)])
+
+
+class EntitySprite:
+    """Vista tipo sprite de una entidad del almacén (image, rect, lane, speed, reset)."""
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def image(self):
+        return self.store.images[int(self.store.kind[self.index])]
+
+    @property
+    def rect(self):
+        return self.store.rect(self.index)
+
+    @property
+    def lane(self):
+        return int(self.store.lane[self.index])
+
+    @property
+    def speed(self):
+        return float(self.store.speed[self.index])
+
+    def reset(self, player_lane=None):
+        self.store.reset(self.index, LANES // 2 if player_lane is None else player_lane)
+
+
+class EntityGroup:
+    """Vista de todas las entidades de un tipo, compatible con el uso de pygame.sprite.Group."""
+    def __init__(self, store, kind):
+        self.store = store
+        self.kind = kind
+
+    def __len__(self):
+        return self.store.counts[self.kind]
+
+    def __iter__(self):
+        store = self.store
+        for i in np.flatnonzero(store.kind[:store.count] == self.kind).tolist():
+            yield EntitySprite(store, i)
+
+    def sprites(self):
+        return list(self)
+
+    def draw(self, surface):
+        return self.store.draw(surface, self.kind)
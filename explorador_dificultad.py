@@ -0,0 +1,196 @@
+# explorador_dificultad.py
+# Explora la curva de dificultad de config.py simulando miles de partidas en paralelo.
+# Cada combinación de parámetros (por ejemplo SPEED_GROWTH_RATE y LEVEL_UP_GROWTH_RATE)
+# se juega con bots sobre el núcleo de simulación y se reportan distribuciones de
+# tiempo de supervivencia, nivel final y puntuación.
+#
+# Uso:
+#   python explorador_dificultad.py --param SPEED_GROWTH_RATE 1.1 1.2 1.3 \
+#       --param LEVEL_UP_GROWTH_RATE 1.2 1.3 --runs 500 --bot esquivador
+import argparse
+import itertools
+import multiprocessing
+import os
+import random
+import statistics
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # Los procesos de trabajo no abren ventana
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import config
+from config import FPS, HEIGHT, LANES
+from simulacion import SimulationState, run_session
+
+LOOKAHEAD = 200  # Distancia (px) que el bot esquivador revisa por encima del jugador
+
+# Constantes de config.py que la simulación lee en cada partida y por lo tanto se pueden barrer.
+# Las dimensiones (WIDTH, HEIGHT, LANES, LANE_WIDTH...) quedan fijadas al importar
+# entidades.py, sprites.py y assets.py, así que cambiarlas aquí no tendría ningún efecto.
+SWEEPABLE = (
+    'LIVES', 'INVINCIBLE_FRAMES',
+    'BASE_SPEED', 'SPEED_GROWTH_RATE', 'MAX_SPEED',
+    'BASE_POINTS', 'POINTS_GROWTH',
+    'BASE_LEVEL_UP', 'LEVEL_UP_GROWTH_RATE',
+    'BASE_ENEMIES', 'BASE_OBSTACLES', 'MAX_ENEMIES', 'MAX_OBSTACLES',
+)
+
+
+# --- Bots ---
+# Cada bot recibe el estado y devuelve un movimiento por jugador (-1, 0 o 1)
+
+def idle_bot(state):
+    """No se mueve nunca (línea base)."""
+    return [0] * len(state.players)
+
+
+def random_bot(state):
+    """Cambia de carril al azar de vez en cuando."""
+    return [random.choice((-1, 0, 0, 0, 0, 0, 0, 0, 0, 1)) for _ in state.players]
+
+
+def _lane_threats(state):
+    """Carriles con un rival u obstáculo a punto de alcanzar a los jugadores."""
+    entities = state.entities
+    n = entities.count
+    y = entities.y[:n]
+    danger_top = HEIGHT - 10 - 60 - LOOKAHEAD
+    near = (y + entities.height >= danger_top) & (y <= HEIGHT)
+    return set(entities.lane[:n][near].tolist())
+
+
+def dodge_bot(state):
+    """Se aparta hacia el carril libre más cercano cuando ve peligro en el suyo."""
+    threats = _lane_threats(state)
+    moves = []
+    for player in state.players:
+        move = 0
+        if player.lane in threats:
+            for offset in (1, 2, 3, 4, 5):
+                free = [lane for lane in (player.lane - offset, player.lane + offset)
+                        if 0 <= lane < LANES and lane not in threats]
+                if free:
+                    move = -1 if free[0] < player.lane else 1
+                    break
+        moves.append(move)
+    return moves
+
+
+BOTS = {
+    'quieto': idle_bot,
+    'aleatorio': random_bot,
+    'esquivador': dodge_bot,
+}
+
+
+# --- Ejecución de partidas ---
+
+def run_trial(task):
+    """
+    Juega una partida en un proceso de trabajo.
+    task: (params, seed, bot, players, max_ticks)
+    Returns: (params, ticks, nivel, puntuación)
+    """
+    params, seed, bot, players, max_ticks = task
+    for name, value in params:
+        setattr(config, name, value)
+    state = SimulationState(skins=(None,) * players, seed=seed)
+    run_session(state, BOTS[bot], max_ticks=max_ticks)
+    return params, state.tick, state.level, max(state.scores)
+
+
+def _summary(values):
+    """Media, mediana y percentiles 10/90 de una lista de valores."""
+    if len(values) < 2:
+        value = values[0] if values else 0
+        return {'media': value, 'p10': value, 'mediana': value, 'p90': value}
+    deciles = statistics.quantiles(values, n=10)
+    return {
+        'media': statistics.fmean(values),
+        'p10': deciles[0],
+        'mediana': statistics.median(values),
+        'p90': deciles[-1],
+    }
+
+
+def sweep(grid, runs=200, bot='esquivador', players=1, max_ticks=FPS * 600, processes=None, seed=0):
+    """
+    Barre todas las combinaciones de parámetros de config y juega `runs` partidas por combinación.
+    Argumentos:
+        grid: Diccionario {nombre_parametro: [valores]} con constantes de SWEEPABLE.
+        runs: Partidas por combinación (las semillas se repiten entre combinaciones
+              para que las comparaciones usen los mismos escenarios).
+        bot: Nombre del bot en BOTS.
+        players: 1 o 2 jugadores.
+        max_ticks: Límite de frames por partida.
+        processes: Procesos de trabajo (por defecto, uno por núcleo).
+        seed: Semilla base.
+    Returns:
+        Diccionario {params: {'supervivencia_s': ..., 'nivel': ..., 'puntuacion': ...}}
+    """
+    for name in grid:
+        if name not in SWEEPABLE:
+            raise ValueError(f"Parámetro no barrible: {name} (opciones: {', '.join(SWEEPABLE)})")
+    if bot not in BOTS:
+        raise ValueError(f"Bot desconocido: {bot}")
+    names = sorted(grid)
+    combos = [tuple(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+    tasks = [(params, seed + i, bot, players, max_ticks) for params in combos for i in range(runs)]
+
+    processes = processes or os.cpu_count() or 1
+    # Bloques grandes para que el costo de comunicación entre procesos sea despreciable
+    chunksize = max(1, len(tasks) // (processes * 8))
+    results = {params: ([], [], []) for params in combos}
+    with multiprocessing.Pool(processes) as pool:
+        for params, ticks, level, score in pool.imap_unordered(run_trial, tasks, chunksize=chunksize):
+            survival, levels, scores = results[params]
+            survival.append(ticks / FPS)
+            levels.append(level)
+            scores.append(score)
+
+    return {
+        params: {
+            'supervivencia_s': _summary(survival),
+            'nivel': _summary(levels),
+            'puntuacion': _summary(scores),
+        }
+        for params, (survival, levels, scores) in results.items()
+    }
+
+
+def print_report(report):
+    """Imprime una tabla con la distribución de cada métrica por combinación."""
+    for params, metrics in report.items():
+        label = ', '.join(f"{name}={value}" for name, value in params) or '(config actual)'
+        print(label)
+        for metric, stats in metrics.items():
+            print(f"    {metric:<16} media={stats['media']:9.1f}  p10={stats['p10']:9.1f}  "
+                  f"mediana={stats['mediana']:9.1f}  p90={stats['p90']:9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Explorador Monte-Carlo de la curva de dificultad")
+    parser.add_argument('--param', nargs='+', action='append', default=[], metavar=('NOMBRE', 'VALOR'),
+                        help="Constante de config.py (ver SWEEPABLE) seguida de los valores a probar")
+    parser.add_argument('--runs', type=int, default=200, help="Partidas por combinación")
+    parser.add_argument('--bot', choices=sorted(BOTS), default='esquivador')
+    parser.add_argument('--players', type=int, choices=(1, 2), default=1)
+    parser.add_argument('--max-seconds', type=float, default=600, help="Duración máxima de cada partida")
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    grid = {}
+    for name, *values in args.param:
+        if not values:
+            parser.error(f"--param {name} necesita al menos un valor")
+        if name not in SWEEPABLE:
+            parser.error(f"--param {name}: no se puede barrer; opciones: {', '.join(SWEEPABLE)}")
+        grid[name] = [int(v) if v.lstrip('-').isdigit() else float(v) for v in values]
+    report = sweep(grid, runs=args.runs, bot=args.bot, players=args.players,
+                   max_ticks=int(args.max_seconds * FPS), processes=args.processes, seed=args.seed)
+    print_report(report)
+
+
+if __name__ == '__main__':
+    main()
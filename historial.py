@@ -0,0 +1,134 @@
+# historial.py
+# Historial de partidas en SQLite (opcional, se activa con config.SCORE_DATABASE).
+# Cada partida terminada se guarda con iniciales, puntuación, nivel, modo, clima,
+# duración y fecha. La base usa WAL para que escribir una partida no bloquee las lecturas.
+# Los índices responden sin recorrer la tabla:
+#   - posición y percentil: tabla score_counts (cuántas partidas hay con cada puntuación),
+#     mantenida por un trigger; se suman solo las puntuaciones distintas, no las filas.
+#   - mejor marca por iniciales: índice (initials, score).
+#   - mejores N por clima: índice (weather, score).
+# highscores.json sigue existiendo como vista exportada de los mejores (puntuaciones.Leaderboard).
+import sqlite3
+import time
+import config
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    initials TEXT,
+    score INTEGER NOT NULL,
+    level INTEGER,
+    mode TEXT,
+    weather TEXT,
+    duration REAL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_score ON runs (score);
+CREATE INDEX IF NOT EXISTS runs_initials_score ON runs (initials, score);
+CREATE INDEX IF NOT EXISTS runs_weather_score ON runs (weather, score);
+CREATE TABLE IF NOT EXISTS score_counts (
+    score INTEGER PRIMARY KEY,
+    runs INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS runs_count AFTER INSERT ON runs BEGIN
+    INSERT INTO score_counts (score, runs) VALUES (NEW.score, 1)
+    ON CONFLICT (score) DO UPDATE SET runs = runs + 1;
+END;
+"""
+
+
+class RunHistory:
+    """Partidas guardadas en una base SQLite; todas las consultas usan índices."""
+    def __init__(self, path=None):
+        self.path = path or config.SCORE_DATABASE
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # En WAL no se pierde consistencia, solo la última transacción ante un corte
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+        if version < SCHEMA_VERSION:
+            self._import_scores()
+
+    def _import_scores(self):
+        # Base nueva: empieza con los récords que ya había en highscores.json
+        scores = config.load_scores()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO runs (initials, score, played_at) VALUES (?, ?, ?)",
+                [(initials, score, time.time()) for initials, score in scores])
+            self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        print(f"Historial creado en {self.path} con {len(scores)} puntuaciones importadas")
+
+    def add_run(self, score, level=None, mode=None, weather=None, duration=None, initials=None):
+        """
+        Guarda una partida terminada.
+        Argumentos:
+            score: Puntuación final.
+            level: Nivel alcanzado.
+            mode: '1P' o '2P'.
+            weather: Clima de la partida.
+            duration: Duración en segundos.
+            initials: Iniciales, si ya se conocen (se pueden poner después con set_initials).
+        Returns: id de la partida.
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (initials, score, level, mode, weather, duration, played_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (initials, score, level, mode, weather, duration, time.time()))
+        return cursor.lastrowid
+
+    def set_initials(self, run_id, initials):
+        with self.conn:
+            self.conn.execute("UPDATE runs SET initials = ? WHERE id = ?", (initials, run_id))
+
+    def count(self):
+        return self.conn.execute("SELECT COALESCE(SUM(runs), 0) FROM score_counts").fetchone()[0]
+
+    def rank(self, score):
+        """Posición que ocupa score entre todas las partidas (1 = la mejor)."""
+        better = self.conn.execute(
+            "SELECT COALESCE(SUM(runs), 0) FROM score_counts WHERE score > ?", (score,)).fetchone()[0]
+        return better + 1
+
+    def percentile(self, score):
+        """Porcentaje de partidas con menor puntuación que score (0-100)."""
+        total = self.count()
+        if not total:
+            return 100.0
+        worse = self.conn.execute(
+            "SELECT COALESCE(SUM(runs), 0) FROM score_counts WHERE score < ?", (score,)).fetchone()[0]
+        return 100.0 * worse / total
+
+    def personal_best(self, initials):
+        """Mejor puntuación de unas iniciales, o None si no han jugado."""
+        return self.conn.execute(
+            "SELECT MAX(score) FROM runs WHERE initials = ?", (initials.upper(),)).fetchone()[0]
+
+    def top(self, n, weather=None):
+        """Las n mejores partidas como (iniciales, puntuación), opcionalmente de un clima."""
+        if weather is None:
+            rows = self.conn.execute(
+                "SELECT initials, score FROM runs ORDER BY score DESC, id LIMIT ?", (n,))
+        else:
+            rows = self.conn.execute(
+                "SELECT initials, score FROM runs WHERE weather = ? ORDER BY score DESC, id LIMIT ?",
+                (weather, n))
+        return [(initials or '---', score) for initials, score in rows]
+
+    def close(self):
+        self.conn.close()
+
+
+_history = None
+
+
+def get_history():
+    """Historial compartido, o None si config.SCORE_DATABASE no está definido."""
+    global _history
+    if _history is None and config.SCORE_DATABASE:
+        _history = RunHistory(config.SCORE_DATABASE)
+    return _history
@@ -5,7 +5,6 @@ import random
 import json
 import os
 import sys
-import math
 import traceback
 import pygame_menu.events
 import pygame_menu.widgets
@@ -13,11 +12,15 @@ from pygame.locals import *
 from skines_obtenidas import SkinManager
 from tienda import StoreManager
 from canciones import ManejoMusica
-from sprites import LaneManager, Player, Rival, Obstacle, Explosion, ScoreDisplay, Rain, Lightning, Snow, Sunrise
+from sprites import explosion_pool, ScoreDisplay, Rain, Lightning, Snow, Sunrise
+from simulacion import SimulationState, step
+from renderizado import DirtyRenderer, RoadLayer
+from pausa import PauseScene, CLOSE, QUIT_GAME, RESTART
 from juego_dos_jugadores import game_loop_2p
 import config  # Importar configuraciones del juego
-from assets import load_images  # Importar utilidad para cargar imágenes
+from assets import load_images, load_background, registry  # Registro de imágenes cargadas una vez
 from creditos import mostrar_creditos
+from precarga import preload, SplashScreen
 
 
 
@@ -25,37 +28,24 @@ from creditos import mostrar_creditos
 def game_loop(surface, store_manager, music_manager, player_skin,background):
     music_manager.play_game('game_music.mp3')  # Inicia la música de fondo del juego
     clock = pygame.time.Clock()
-    lane_manager = LaneManager()  # Administra la ocupación de carriles
-    player = Player(2, {'left': pygame.K_LEFT, 'right': pygame.K_RIGHT}, player_skin)  # Inicializa al jugador
-    score_display = ScoreDisplay(player_skin)  # Inicializa la interfaz de usuario (HUD)
-    current_level = 1
-    current_speed = config.get_level_speed(current_level)  # Obtiene velocidad inicial
-    points_per_car = config.get_level_points(current_level)  # Puntos por rival superado
-    enemy_count = config.get_enemy_count(current_level)  # Cantidad de rivales
-    obstacle_count = config.get_obstacle_count(current_level)  # Cantidad de obstáculos
-    rivals = pygame.sprite.Group()  # Grupo para autos rivales
-    obstacles = pygame.sprite.Group()  # Grupo para obstáculos
     explosions = pygame.sprite.Group()  # Grupo para efectos de explosión
     
     # Inicializa efectos climáticos según CURRENT_WEATHER
-    weather_sprites = pygame.sprite.Group()
+    weather_particles = None  # Partículas de lluvia o nieve (sistema vectorizado)
     weather_effect = None
     #TODO: Asegurar consistencia en la configuración del clima entre modos de juego
     print(f"Clima actual en game_loop: {config.CURRENT_WEATHER}")  # Depuración de configuración de clima
     if config.CURRENT_WEATHER.strip() == 'lluvioso':
-        for _ in range(50):
-            weather_sprites.add(Rain())  # Añade partículas de lluvia
+        weather_particles = Rain(config.RAIN_PARTICLES)  # Añade partículas de lluvia
         weather_effect = Lightning()  # Añade efecto de relámpago
     elif config.CURRENT_WEATHER.strip()  == 'nevado':
-        for _ in range(50):
-            weather_sprites.add(Snow())  # Añade partículas de nieve
+        weather_particles = Snow(config.SNOW_PARTICLES)  # Añade partículas de nieve
         weather_effect = None
     elif config.CURRENT_WEATHER.strip()  == 'amanecer':
-        weather_effect = Sunrise()  # Añade efecto de amanecer
+        weather_effect = Sunrise(config.SUNRISE_STARS)  # Añade efecto de amanecer
     else:
         print(f"Advertencia: Clima desconocido '{config.CURRENT_WEATHER}', usando lluvia por defecto")
-        for _ in range(50):
-            weather_sprites.add(Rain())
+        weather_particles = Rain(config.RAIN_PARTICLES)
         weather_effect = Lightning()
     
     ENEMY_IMG, OBSTACLE_IMG = load_images()  # Carga imágenes de rivales y obstáculos
@@ -63,19 +53,20 @@ def game_loop(surface, store_manager, music_manager, player_skin,background):
     print(f"Loaded OBSTACLE_IMG size: {OBSTACLE_IMG.get_size()}")
     print(f"LANE_WIDTH: {config.LANE_WIDTH}")
 
-    for _ in range(enemy_count):
-        rivals.add(Rival(current_speed, lane_manager, ENEMY_IMG))  # Genera rivales
-    for _ in range(obstacle_count):
-        obstacles.add(Obstacle(current_speed, lane_manager, OBSTACLE_IMG, debug=False))  # Genera obstáculos
+    # La lógica del juego (jugador, rivales, obstáculos, niveles) vive en el núcleo de simulación
+    state = SimulationState(skins=[player_skin], enemy_img=ENEMY_IMG, obstacle_img=OBSTACLE_IMG)
+    player = state.players[0]
+    score_display = ScoreDisplay(player_skin)  # Inicializa la interfaz de usuario (HUD)
+
+    # Carretera pre-compuesta según el clima y presentación por zonas sucias (opcional)
+    road = RoadLayer(config.CURRENT_WEATHER, scrolling=config.SCROLLING_ROAD)
+    renderer = DirtyRenderer(enabled=config.DIRTY_RECT_RENDERING)
 
-    score = 0
-    lives = config.LIVES
     running = True
     paused = False
-    font = pygame.font.SysFont(None, 48)
 
     while running:
-        
+        moves = [0]  # Movimiento acumulado del jugador en este frame
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 music_manager.limpieza()  # Libera recursos de música
@@ -83,120 +74,91 @@ def game_loop(surface, store_manager, music_manager, player_skin,background):
                 sys.exit()
             if event.type == pygame.KEYDOWN:
                 if event.key == player.controls['left']:
-                    player.move_left()
+                    moves[0] -= 1
                 elif event.key == player.controls['right']:
-                    player.move_right()
-                elif event.key == pygame.K_p:
-                    paused = not paused  # Alterna estado de pausa
-                elif event.key == pygame.K_ESCAPE:
-                    if paused:
-                        store_manager.add_points(score)  # Guarda puntuación
-                        music_manager.play_game('menu_music.mp3')
-                        return
-                    paused = True
-                    
-        surface.blit(background, (0, 0)) 
+                    moves[0] += 1
+                elif event.key in (pygame.K_p, pygame.K_ESCAPE):
+                    paused = True  # La pausa espera sus propias teclas (P, R, ESC)
 
-        
-        
         if paused:
-            pause_surface = pygame.Surface((config.WIDTH, config.HEIGHT), pygame.SRCALPHA)
-            pause_surface.fill((0, 0, 0, 150))  # Superposición semi-transparente para pausa
-            surface.blit(pause_surface, (0, 0))
-            pause_text = font.render("PAUSA", True, (255, 255, 255))
-            continue_text = font.render("P: Continuar", True, (200, 200, 200))
-            restart_text = font.render("R: Reiniciar", True, (200, 200, 200))
-            quit_text = font.render("ESC: Salir", True, (200, 200, 200))
-            surface.blit(pause_text, (config.WIDTH//2 - pause_text.get_width()//2, config.HEIGHT//2 - 100))
-            surface.blit(continue_text, (config.WIDTH//2 - continue_text.get_width()//2, config.HEIGHT//2))
-            surface.blit(restart_text, (config.WIDTH//2 - restart_text.get_width()//2, config.HEIGHT//2 + 50))
-            surface.blit(quit_text, (config.WIDTH//2 - quit_text.get_width()//2, config.HEIGHT//2 + 100))
-            pygame.display.flip()
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_r]:
-                store_manager.add_points(score)
+            # Pausa sobre la imagen de fondo, compuesta una vez y sin redibujar cada tick
+            action = PauseScene(surface, background).run()
+            paused = False
+            renderer.invalidate()  # Al volver de la pausa se repinta todo
+            if action == CLOSE:
+                music_manager.limpieza()  # Libera recursos de música
+                pygame.quit()
+                sys.exit()
+            if action in (QUIT_GAME, RESTART):
+                explosion_pool.release_all(explosions)  # Las explosiones en curso vuelven al pool
+            if action == QUIT_GAME:
+                store_manager.add_points(state.scores[0])  # Guarda puntuación
+                music_manager.play_game('menu_music.mp3')
+                return
+            if action == RESTART:
+                store_manager.add_points(state.scores[0])
                 music_manager.play_game('game_music.mp3')
                 return game_loop(surface, store_manager, music_manager, player_skin, background)
             clock.tick(config.FPS)
             continue
 
-        player.update()
+        events = step(state, moves)  # Avanza la lógica del juego un frame
         explosions.update()
-        weather_sprites.update()
+        if weather_particles:
+            weather_particles.update()
         if weather_effect:
             weather_effect.update(music_manager)
 
-        for r in rivals:
-            if r.update(player.lane):
-                score += points_per_car
-                new_level = math.floor(score / config.get_level_up_threshold(current_level)) + 1
-                if new_level > current_level:
-                    current_level = new_level
-                    current_speed = config.get_level_speed(current_level)
-                    points_per_car = config.get_level_points(current_level)
-                    for spr in rivals:
-                        spr.speed = current_speed
-                    for spr in obstacles:
-                        spr.speed = current_speed
-                    new_enemy_count = config.get_enemy_count(current_level)
-                    new_obstacle_count = config.get_obstacle_count(current_level)
-                    while len(rivals) < new_enemy_count:
-                        rivals.add(Rival(current_speed, lane_manager, ENEMY_IMG))
-                    while len(obstacles) < new_obstacle_count:
-                        obstacles.add(Obstacle(current_speed, lane_manager, OBSTACLE_IMG, debug=False))
-
-        for o in obstacles:
-            o.update(player.lane)
-
-        if not player.invincible:
-            rival_hit = pygame.sprite.spritecollideany(player, rivals)
-            obstacle_hit = pygame.sprite.spritecollideany(player, obstacles)
-            if rival_hit or obstacle_hit:
-                explosion = Explosion(player.rect.center)
-                explosions.add(explosion)
-                lives -= 1
-                player.set_invincible(90)
-                if rival_hit:
-                    rival_hit.reset(player.lane)
+        for sim_event in events:
+            if sim_event[0] == 'hit':
+                _, _, pos, obstacle_hit = sim_event
+                explosion_pool.spawn(pos, explosions)  # Recicla explosiones terminadas
                 if obstacle_hit:
                     print("Reproduciendo explosión")
                     music_manager.play_sound('explosion_sound.mp3')
-                    obstacle_hit.reset(player.lane)
-                if lives == 0:
-                    store_manager.add_points(score)
-                    #TODO: Verificar si la puntuación califica para el top 5
-                    current_scores = config.load_scores()
-                    qualifies_for_top_5 = len(current_scores) < 5 or any(score > s[1] for s in current_scores[:5])
-                    if qualifies_for_top_5:
-                        show_initials_input_menu(surface, score, music_manager, lambda: show_game_over_menu(surface, score, 0, music_manager, player_skin, None, store_manager))
-                    else:
-                        show_game_over_menu(surface, score, 0, music_manager, player_skin, None, store_manager)
-                    break
 
-        # Cambia el fondo según el clima
-        if config.CURRENT_WEATHER == '   lluvioso   ':
-            surface.fill((10, 10, 30))
-        elif config.CURRENT_WEATHER == '  nevado   ':
-            surface.fill((50, 50, 80))
-        elif config.CURRENT_WEATHER == 'amanecer':
-            weather_effect.draw(surface)
-        else:
-            surface.fill((10, 10, 30))
+        score = state.scores[0]
+        if state.game_over:
+            explosion_pool.release_all(explosions)
+            store_manager.add_points(score)
+            run_id = config.record_run(score, state.level, '1P', config.CURRENT_WEATHER.strip(), state.tick / config.FPS)
+            #TODO: Verificar si la puntuación califica para el top 5
+            qualifies_for_top_5 = config.qualifies_for_top(score)  # Tabla en memoria, sin leer el disco
+            if qualifies_for_top_5:
+                show_initials_input_menu(surface, score, music_manager, lambda: show_game_over_menu(surface, score, 0, music_manager, player_skin, None, store_manager), run_id)
+            else:
+                show_game_over_menu(surface, score, 0, music_manager, player_skin, None, store_manager)
+            break
 
-        weather_sprites.draw(surface)
-        for i in range(1, config.LANES):
-            pygame.draw.line(surface, (200, 200, 200), (i*config.LANE_WIDTH, 0), (i*config.LANE_WIDTH, config.HEIGHT))
-        rivals.draw(surface)
-        obstacles.draw(surface)
-        surface.blit(player.image, player.rect)
+        # Frame completo, o solo se restauran las zonas del frame anterior
+        road.update(state.speed)
+        if renderer.begin_frame(surface, road.surface, road, weather_particles, weather_effect):
+            road.draw(surface)  # Fondo según el clima y líneas de carril en un solo blit
+        # Estrellas y partículas se dibujan en cada frame; en modo por zonas se envían sus rectángulos
+        if config.CURRENT_WEATHER == 'amanecer':
+            renderer.add(weather_effect.draw(surface))
+        if weather_particles:
+            renderer.add(weather_particles.draw(surface))
+        renderer.add(state.rivals.draw(surface))
+        renderer.add(state.obstacles.draw(surface))
+        renderer.add([surface.blit(player.image, player.rect)])
         explosions.draw(surface)
+        renderer.add([explosion.rect for explosion in explosions])
         if weather_effect and config.CURRENT_WEATHER != 'amanecer':
             weather_effect.draw(surface)
-        score_display.update(score, 0, current_level, lives)
+        score_display.update(score, 0, state.level, state.lives[0])
         score_display.draw(surface)
-        pygame.display.flip()
+        renderer.mark_hud(score_display.rect, (score, state.level, state.lives[0]))
+        renderer.present()
         clock.tick(config.FPS)
 
+    if renderer.enabled:
+        print(f"Renderizado por zonas: {renderer.stats()}")
+    if config.HUD_STATS:
+        print(f"Renders del HUD: {score_display.stats()}")
+        print(f"Pool de explosiones: {explosion_pool.stats()}")
+    if config.AUDIO_STATS:
+        print(f"Efectos de sonido: {music_manager.sfx_report()}")
     music_manager.play_game('menu_music.mp3')
     return
 
@@ -205,14 +167,16 @@ def main():
     pygame.init()
     surface = pygame.display.set_mode((config.WIDTH, config.HEIGHT))
     pygame.display.set_caption("Juego Retro de Carritos")
+    splash = SplashScreen(surface)
+    splash.draw(0, 1)  # Primer frame en pantalla antes de cargar nada pesado
 
     skin_manager = SkinManager(config.WIDTH, config.HEIGHT)
     store_manager = StoreManager(config.WIDTH, config.HEIGHT, skin_manager)
     music_manager = ManejoMusica()
+    # Imágenes, skins y sonidos se decodifican en hilos mientras avanza la barra de carga
+    preload(surface, skin_manager, store_manager, music_manager, splash=splash)
 
-    menu_background_image = pygame.image.load('IMG_FOLDER/fondo.png').convert()  # Asegúrate de que la ruta es correcta
-    menu_background_image = pygame.transform.scale(menu_background_image, (config.WIDTH, config.HEIGHT))
- # <-- Asigna la imagen como fondo
+    background = load_background((config.WIDTH, config.HEIGHT))  # Fondo de los menús (una sola carga)
     # Configura el tema del menú
     menu_theme = pygame_menu.themes.THEME_DARK.copy()
     menu_theme.background_color = (0, 0, 0, 0) 
@@ -232,8 +196,6 @@ def main():
     menu_theme.widget_padding = (8, 35)
     menu_theme.widget_margin = (0, 10)
     menu_theme.widget_font = pygame_menu.font.FONT_8BIT
-    background = pygame.image.load('IMG_FOLDER/fondo.png').convert()
-    background = pygame.transform.scale(background, (config.WIDTH, config.HEIGHT))
     
     menu = pygame_menu.Menu(
         title='Carreras Retro',
@@ -242,6 +204,7 @@ def main():
         theme=menu_theme
     )
     music_manager.play_game('menu_music.mp3')
+    music_manager.prepare_music('game_music.mp3')  # Lista en memoria para el primer cambio de escena
 
     # Muestra el menú de selección de skins
     def show_skin_menu(menu, surface, skin_manager):
@@ -283,10 +246,10 @@ def main():
         print(f"Clima cambiado a: {config.CURRENT_WEATHER}")
 
     #TODO: Cargar y mostrar las puntuaciones altas en el menú principal
-    scores = config.load_scores()
+    scores = config.get_top_scores(config.TOP_SCORES_SHOWN)
     if scores:
         menu.add.label("Records", font_size=20, align=pygame_menu.locals.ALIGN_LEFT)
-        for i, (initials, s) in enumerate(scores[:5]):
+        for i, (initials, s) in enumerate(scores):
             menu.add.label(f"N{i+1}  {initials}: {s}", font_size=12, align=pygame_menu.locals.ALIGN_LEFT)
         menu.add.vertical_margin(20)
 
@@ -329,7 +292,8 @@ def main():
             # callback que reabre el menú principal con bgfun
             lambda: menu.mainloop(surface, bgfun=pintar_fondo),
             # y también lo paso aquí para créditos
-            bgfun=pintar_fondo
+            bgfun=pintar_fondo,
+            music_manager=music_manager
         ),
         align=pygame_menu.locals.ALIGN_CENTER
     )
@@ -378,6 +342,9 @@ def main():
 
     
     
+    if config.ASSET_MEMORY_REPORT:
+        registry.print_memory_report()
+
     running = True
     while running:
         # Dibuja la imagen de fondo
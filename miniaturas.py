@@ -0,0 +1,126 @@
+# miniaturas.py
+# Caché en disco de miniaturas de skins.
+# Cada PNG de SKIN_STORE se escala una sola vez a cada tamaño en que se muestra (tienda,
+# selector y juego) y se guarda como PNG pequeño en THUMBNAIL_CACHE_DIR. En tiempo de
+# ejecución los menús cargan la miniatura ya escalada en vez de decodificar el original.
+# La clave es el hash del contenido del PNG original más el tamaño, así que si la skin
+# cambia se genera una entrada nueva (reconstrucción incremental); build() genera las que
+# falten y borra las que ya no corresponden a ninguna skin:
+#     python miniaturas.py
+import hashlib
+import json
+import os
+import re
+import threading
+import pygame
+import config
+from assets import registry
+
+THUMB_SIZES = [(100, 100), (200, 200), (150, 150), (100, 60)]  # Tienda, selector (grande y reducido) y juego
+INDEX_FILE = 'indice.json'  # ruta|mtime|tamaño -> hash del contenido (evita volver a leer el PNG)
+THUMB_NAME = re.compile(r'^[0-9a-f]{40}_\d+x\d+\.png$')  # Nombre de una miniatura: <sha1>_<ancho>x<alto>.png
+
+_lock = threading.Lock()  # La precarga y la tienda cargan miniaturas desde varios hilos
+_index = None
+stats = {'hits': 0, 'misses': 0}
+
+
+def _index_path():
+    return os.path.join(config.THUMBNAIL_CACHE_DIR, INDEX_FILE)
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        try:
+            with open(_index_path(), 'r', encoding='utf-8') as f:
+                _index = json.load(f)
+        except (OSError, ValueError):
+            _index = {}
+    return _index
+
+
+def _save_index():
+    os.makedirs(config.THUMBNAIL_CACHE_DIR, exist_ok=True)
+    temp_path = _index_path() + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(_index, f)
+    os.replace(temp_path, _index_path())
+
+
+def _content_hash(path):
+    """Hash del PNG original; solo se recalcula si cambia su fecha de modificación o su tamaño."""
+    st = os.stat(path)
+    entry = f"{os.path.normpath(path)}|{st.st_mtime_ns}|{st.st_size}"
+    with _lock:
+        digest = _load_index().get(entry)
+    if digest is None:
+        with open(path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        with _lock:
+            index = _load_index()
+            # Las entradas antiguas de la misma ruta ya no sirven
+            prefix = os.path.normpath(path) + '|'
+            for key in [k for k in index if k.startswith(prefix)]:
+                del index[key]
+            index[entry] = digest
+            _save_index()
+    return digest
+
+
+def thumbnail_path(path, size):
+    """Archivo de la caché para la miniatura de path a size (ancho, alto)."""
+    return os.path.join(config.THUMBNAIL_CACHE_DIR, f"{_content_hash(path)}_{size[0]}x{size[1]}.png")
+
+
+def load_thumbnail(path, size):
+    """
+    Devuelve la imagen de path escalada a size, usando la caché en disco.
+    La primera vez decodifica el original, lo escala y guarda la miniatura.
+    No convierte al formato de pantalla, así que se puede llamar desde otro hilo.
+    """
+    size = tuple(size)
+    if not config.THUMBNAIL_CACHE:
+        return pygame.transform.scale(registry.decode(path), size)
+    thumb_path = thumbnail_path(path, size)
+    if os.path.exists(thumb_path):
+        stats['hits'] += 1
+        return pygame.image.load(thumb_path)
+    stats['misses'] += 1
+    image = pygame.transform.scale(registry.decode(path), size)
+    os.makedirs(config.THUMBNAIL_CACHE_DIR, exist_ok=True)
+    # Escritura atómica: otro hilo o una sesión interrumpida nunca ve un archivo a medias
+    temp_path = f"{thumb_path}.{threading.get_ident()}.tmp.png"
+    pygame.image.save(image, temp_path)
+    os.replace(temp_path, thumb_path)
+    return image
+
+
+def build(folder, sizes=THUMB_SIZES):
+    """
+    Paso de construcción: genera las miniaturas que falten para cada PNG de folder y borra
+    las que ya no corresponden a ningún original (los temporales de otros hilos no se tocan).
+    Returns: (generadas, borradas).
+    """
+    os.makedirs(config.THUMBNAIL_CACHE_DIR, exist_ok=True)
+    sources = [os.path.join(folder, name) for name in sorted(os.listdir(folder))
+               if name.lower().endswith('.png')]
+    before = stats['misses']
+    wanted = set()
+    for path in sources:
+        for size in sizes:
+            wanted.add(os.path.basename(thumbnail_path(path, size)))
+            load_thumbnail(path, size)
+    removed = 0
+    for name in os.listdir(config.THUMBNAIL_CACHE_DIR):
+        # Solo miniaturas con el formato de la clave; los temporales son de escrituras en curso
+        if THUMB_NAME.match(name) and name not in wanted:
+            os.remove(os.path.join(config.THUMBNAIL_CACHE_DIR, name))
+            removed += 1
+    return stats['misses'] - before, removed
+
+
+if __name__ == '__main__':
+    from skines_obtenidas import SKIN_FOLDER
+    created, removed = build(SKIN_FOLDER)
+    print(f"Miniaturas: {created} generadas, {removed} borradas en {config.THUMBNAIL_CACHE_DIR}")
@@ -1,8 +1,8 @@
 import pygame
 import pygame_menu
-from config import save_scores, load_scores, add_score, WIDTH, HEIGHT
+from config import add_score, get_top_scores, get_score_rank, WIDTH, HEIGHT, TOP_SCORES_SHOWN
 
-def show_initials_input_menu(surface, score, music_manager, on_return):
+def show_initials_input_menu(surface, score, music_manager, on_return, run_id=None):
     print(f"Mostrando menú para ingresar iniciales con puntuacion: {score}")
     music_manager.play_game('menu_music.mp3')
     
@@ -41,7 +41,7 @@ def show_initials_input_menu(surface, score, music_manager, on_return):
             pygame.time.set_timer(ERROR_TIMEOUT_EVENT, 2000, 1)
             return
         try:
-            add_score(initials, score)  # Use add_score instead of save_scores
+            add_score(initials, score, run_id)  # run_id: partida del historial a la que se ponen las iniciales
             print(f"Iniciales y puntuacion guardadas: {initials}, {score}")
             menu.disable()
             if callable(on_return):
@@ -97,17 +97,20 @@ def show_game_over_menu(surface, score1, score2, music_manager, skin1, skin2, st
         menu_over.add.label(f"Total {max(score1, score2)}", font_size=22)
     else:
         menu_over.add.label(f"Puntuacion Final: {score1}", font_size=22)
+    rank = get_score_rank(max(score1, score2))  # Solo con historial SQLite
+    if rank:
+        menu_over.add.label(f"Posicion historica {rank[0]} de {rank[1]}", font_size=18)
     menu_over.add.vertical_margin(15)
 
-    scores = load_scores()
+    scores = get_top_scores(TOP_SCORES_SHOWN)  # Tabla en memoria, sin leer el disco
     print(f"Puntuaciones mostradas en el menú de fin de juego: {scores}")
     menu_over.add.label("Mejores Puntuaciones", font_size=20)
     if scores:
-        for i, (initials, s) in enumerate(scores[:5]):
+        for i, (initials, s) in enumerate(scores):
             menu_over.add.label(f"{i+1}. {initials}: {s}", font_size=18)
     else:
         menu_over.add.label("No hay puntuaciones registradas", font_size=22)
-    for i in range(len(scores), 5):
+    for i in range(len(scores), TOP_SCORES_SHOWN):
         menu_over.add.label(f"{i+1}. ---: 0", font_size=22)
     menu_over.add.vertical_margin(20)
 
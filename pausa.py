@@ -0,0 +1,74 @@
+# pausa.py
+# Escena de pausa compartida por los bucles de uno y dos jugadores.
+# La imagen de pausa (fondo congelado, oscurecido y con los textos) se compone una
+# sola vez; mientras dura la pausa el programa espera eventos con pygame.event.wait
+# y solo vuelve a presentar la imagen cuando la ventana lo necesita.
+import pygame
+from config import WIDTH, HEIGHT
+
+# Acciones que devuelve la pausa
+CONTINUE = 'continuar'
+RESTART = 'reiniciar'
+QUIT_GAME = 'salir'
+CLOSE = 'cerrar'  # Se cerró la ventana
+
+PAUSE_KEYS = {
+    pygame.K_p: CONTINUE,
+    pygame.K_r: RESTART,
+    pygame.K_ESCAPE: QUIT_GAME,
+}
+
+_overlay = None  # Capa oscura con los textos, igual en todas las pausas
+
+
+def _pause_overlay():
+    """Superposición semi-transparente con los textos de la pausa (se renderiza una vez)."""
+    global _overlay
+    if _overlay is None:
+        _overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        _overlay.fill((0, 0, 0, 150))  # Superposición semi-transparente para pausa
+        font = pygame.font.SysFont(None, 48)
+        lines = [
+            ("PAUSA", (255, 255, 255), HEIGHT//2 - 100),
+            ("P: Continuar", (200, 200, 200), HEIGHT//2),
+            ("R: Reiniciar", (200, 200, 200), HEIGHT//2 + 50),
+            ("ESC: Salir", (200, 200, 200), HEIGHT//2 + 100),
+        ]
+        for text, color, y in lines:
+            image = font.render(text, True, color)
+            _overlay.blit(image, (WIDTH//2 - image.get_width()//2, y))
+    return _overlay
+
+
+class PauseScene:
+    """
+    Pantalla de pausa sobre una imagen fija.
+    Argumentos:
+        surface: Pantalla del juego.
+        backdrop: Imagen de fondo de la pausa; si es None se congela el frame actual de surface.
+    """
+    def __init__(self, surface, backdrop=None):
+        self.surface = surface
+        self.frame = (backdrop if backdrop is not None else surface).copy()
+        self.frame.blit(_pause_overlay(), (0, 0))
+        self.redraws = 0
+
+    def draw(self):
+        self.surface.blit(self.frame, (0, 0))
+        pygame.display.flip()
+        self.redraws += 1
+
+    def run(self):
+        """
+        Muestra la pausa y espera sin consumir CPU hasta que el jugador elija una opción.
+        Returns: CONTINUE, RESTART, QUIT_GAME o CLOSE.
+        """
+        self.draw()
+        while True:
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                return CLOSE
+            if event.type == pygame.KEYDOWN and event.key in PAUSE_KEYS:
+                return PAUSE_KEYS[event.key]
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                self.draw()  # La ventana volvió a mostrarse: se presenta de nuevo la misma imagen
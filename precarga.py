@@ -0,0 +1,120 @@
+# precarga.py
+# Precarga de imágenes y sonidos al iniciar el juego.
+# Los archivos se leen y decodifican en un grupo de hilos mientras el hilo principal
+# dibuja una pantalla de carga con barra de progreso. Cada resultado se entrega en el
+# hilo principal a su dueño (registro de assets, caché de skins o ManejoMusica), que
+# es quien convierte y escala la superficie para la pantalla.
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+import config
+from assets import registry, IMG_FOLDER, SPRITE_SIZE
+from canciones import SOUND_MANIFEST, MUSIC_TRACKS
+import cache_audio
+
+CREDITS_FOLDER = 'FOLDER_CREDITOS'
+# Tamaños en los que se muestran las skins: juego, selector de skins y tienda
+GAME_SKIN_SIZE = (100, 60)
+PICKER_SIZE = (150, 150)
+STORE_PREVIEW_SIZE = (100, 100)
+
+
+def _image_tasks():
+    """Imágenes fijas del registro: (ruta, tamaño, escala, alfa)."""
+    return [
+        (os.path.join(IMG_FOLDER, 'enemy_img.png'), SPRITE_SIZE, None, True),
+        (os.path.join(IMG_FOLDER, 'obstaculo.png'), SPRITE_SIZE, None, True),
+        (os.path.join(IMG_FOLDER, 'fondo.png'), (config.WIDTH, config.HEIGHT), None, False),
+        (os.path.join(CREDITS_FOLDER, 'logo.png'), None, (0.3, 0.3), True),
+        (os.path.join(CREDITS_FOLDER, 'brawl.png'), None, (1.2, 1.2), True),
+    ]
+
+
+def _skin_tasks(skin_manager, store_manager):
+    """Skins por archivo: {archivo: [tamaños]} para el juego, el selector y la tienda."""
+    sizes = {}
+    for _, preview, game in skin_manager.available_skins:
+        sizes.setdefault(game, set()).add(GAME_SKIN_SIZE)
+        sizes.setdefault(preview, set()).add(PICKER_SIZE)
+    for _, preview, _, _, _ in store_manager.available_skins:
+        sizes.setdefault(preview, set()).add(STORE_PREVIEW_SIZE)
+    return sizes
+
+
+class SplashScreen:
+    """Pantalla de carga ligera: título, texto y barra de progreso."""
+    def __init__(self, surface):
+        self.surface = surface
+        title_font = pygame.font.SysFont(None, 72)
+        self.font = pygame.font.SysFont(None, 32)
+        self.title = title_font.render("Carreras Retro", True, (255, 69, 0))
+        self.label = self.font.render("Cargando...", True, (200, 200, 200))
+
+    def draw(self, done, total):
+        w, h = self.surface.get_size()
+        self.surface.fill((0, 0, 30))
+        self.surface.blit(self.title, (w//2 - self.title.get_width()//2, h//2 - 120))
+        self.surface.blit(self.label, (w//2 - self.label.get_width()//2, h//2 - 20))
+        bar = pygame.Rect(w//2 - 200, h//2 + 30, 400, 20)
+        pygame.draw.rect(self.surface, (60, 60, 90), bar)
+        fill = bar.copy()
+        fill.width = int(bar.width * done / total) if total else bar.width
+        pygame.draw.rect(self.surface, (255, 215, 0), fill)
+        pygame.draw.rect(self.surface, (255, 255, 255), bar, 2)
+        pygame.display.flip()
+
+
+def preload(surface, skin_manager, store_manager, music_manager, workers=None, splash=None):
+    """
+    Decodifica en hilos las imágenes fijas, las skins y los efectos de sonido mientras
+    se muestra la pantalla de carga. Los errores se informan y el recurso se cargará
+    (o usará su respaldo) cuando se necesite, como antes.
+    Returns: Segundos que tardó la precarga.
+    """
+    start = time.perf_counter()
+    splash = splash or SplashScreen(surface)
+    clock = pygame.time.Clock()
+    jobs = {}  # future -> función que entrega el resultado en el hilo principal
+    with ThreadPoolExecutor(max_workers=workers or config.PRELOAD_WORKERS) as pool:
+        for path, size, scale, alpha in _image_tasks():
+            if not registry.has(path, size, scale, alpha):
+                future = pool.submit(registry.decode, path)
+                jobs[future] = (path, lambda img, p=path, s=size, sc=scale, a=alpha: registry.add(img, p, s, sc, a))
+        # Las skins salen de la caché de miniaturas, ya escaladas a cada tamaño
+        for filename, sizes in _skin_tasks(skin_manager, store_manager).items():
+            for size in sizes:
+                future = pool.submit(skin_manager.skin_cache.read, filename, size)
+                jobs[future] = (filename, lambda result, f=filename, s=size: skin_manager.skin_cache.add(f, s, result[1], result[0]))
+        for sound_file in SOUND_MANIFEST:
+            if sound_file not in music_manager.sounds:
+                future = pool.submit(music_manager.load_sound, sound_file)
+                jobs[future] = (sound_file, lambda sound, f=sound_file: music_manager.add_sound(f, sound))
+        # La música solo se decodifica a la caché PCM en disco; no se guarda en memoria
+        if config.AUDIO_CACHE:
+            for path in MUSIC_TRACKS:
+                if os.path.exists(path) and not os.path.exists(cache_audio.cache_path(path)):
+                    future = pool.submit(cache_audio.load_sound, path)
+                    jobs[future] = (path, lambda sound: None)
+
+        total = len(jobs)
+        pending = dict(jobs)
+        while pending:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    for future in pending:
+                        future.cancel()
+                    pygame.quit()
+                    raise SystemExit
+            # La conversión y el escalado usan la pantalla: se hacen aquí, en el hilo principal
+            for future in [f for f in pending if f.done()]:
+                name, deliver = pending.pop(future)
+                try:
+                    deliver(future.result())
+                except Exception as e:
+                    print(f"Error precargando {name}: {e}")
+            splash.draw(total - len(pending), total)
+            clock.tick(60)
+    elapsed = time.perf_counter() - start
+    print(f"Precarga: {total} recursos en {elapsed:.2f} s")
+    return elapsed
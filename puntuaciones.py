@@ -0,0 +1,115 @@
+# puntuaciones.py
+# Tabla de récords en memoria.
+# Se lee highscores.json una sola vez; las puntuaciones viven en un montículo (heap) de
+# tamaño TOP_SCORES cuya raíz es la peor puntuación guardada, así que saber si una
+# puntuación entra es O(1) y añadirla es O(log K). Aparte se mantiene ordenada la lista
+# corta de las TOP_SCORES_SHOWN mejores, que es la que consultan el fin de partida y los
+# menús. El archivo se reescribe en un hilo aparte (escritura diferida), con escritura a
+# un temporal y renombrado atómico.
+import atexit
+import bisect
+import heapq
+import threading
+import config
+
+
+class Leaderboard:
+    """
+    Mejores TOP_SCORES puntuaciones como (iniciales, puntuación).
+    A igual puntuación queda primero la más antigua, como con la lista ordenada de antes.
+    """
+    def __init__(self, capacity=None):
+        self.capacity = capacity or config.TOP_SCORES
+        self.shown = min(config.TOP_SCORES_SHOWN, self.capacity)
+        self._heap = []  # (puntuación, -orden de llegada, iniciales); la raíz es la peor
+        self._best = []  # Las `shown` mejores entradas, en orden ascendente
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._top = None  # Lista ordenada en caché (se invalida al añadir)
+        self._version = 0  # Cambios en memoria
+        self._saved_version = 0  # Cambios ya escritos en disco
+        self._pending = threading.Event()
+        self._writer = None
+        for initials, score in config.load_scores():
+            self._push(initials, score)
+        self._saved_version = self._version
+
+    def _push(self, initials, score):
+        self._seq += 1
+        entry = (score, -self._seq, initials)
+        if len(self._heap) < self.capacity:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+        else:
+            return False
+        if len(self._best) < self.shown or entry > self._best[0]:
+            bisect.insort(self._best, entry)
+            if len(self._best) > self.shown:
+                self._best.pop(0)
+        self._top = None
+        self._version += 1
+        return True
+
+    def add(self, initials, score):
+        """Añade una puntuación; devuelve True si entró en la tabla. El guardado es asíncrono."""
+        with self._lock:
+            added = self._push(initials.upper(), score)
+        if added:
+            self._schedule_save()
+        return added
+
+    def qualifies(self, score, n=None):
+        """True si score entraría entre las n mejores (por defecto, en toda la tabla)."""
+        n = min(n or self.capacity, self.capacity)
+        with self._lock:
+            if n == self.capacity:
+                return len(self._heap) < n or score > self._heap[0][0]
+            if n <= self.shown:
+                # La n-ésima mejor está en la lista corta: una sola comparación
+                return len(self._best) < n or score > self._best[-n][0]
+        top = self.top(n)
+        return len(top) < n or score > top[-1][1]
+
+    def top(self, n=None):
+        """Las n mejores puntuaciones ordenadas de mayor a menor."""
+        with self._lock:
+            if n and n <= self.shown:
+                return [(initials, score) for score, _, initials in reversed(self._best[-n:])]
+            if self._top is None and n and n < len(self._heap) // 4:
+                # Pocas posiciones: basta con nlargest, sin ordenar toda la tabla
+                return [(initials, score) for score, _, initials in heapq.nlargest(n, self._heap)]
+            if self._top is None:
+                self._top = [(initials, score) for score, _, initials in sorted(self._heap, reverse=True)]
+            return self._top[:n] if n else list(self._top)
+
+    # --- Escritura diferida ---
+    def _schedule_save(self):
+        self._pending.set()
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._writer_loop, name='leaderboard-writer', daemon=True)
+            self._writer.start()
+
+    def _writer_loop(self):
+        while True:
+            self._pending.wait()
+            self._pending.clear()
+            self._save()
+
+    def _save(self):
+        # Varias puntuaciones seguidas se guardan en una sola escritura con el estado más reciente
+        with self._save_lock:
+            version = self._version
+            if version == self._saved_version:
+                return
+            config.save_scores(self.top())
+            self._saved_version = version
+
+    def flush(self):
+        """Escribe ahora los cambios pendientes (al salir del juego)."""
+        self._save()
+
+
+leaderboard = Leaderboard()
+atexit.register(leaderboard.flush)
@@ -0,0 +1,163 @@
+# renderizado.py
+# Presentación por rectángulos sucios para los bucles de juego.
+# En lugar de repintar y enviar los 1000×600 píxeles en cada frame, se borran
+# (restaurando la carretera) las zonas donde había sprites en el frame anterior,
+# se dibujan los sprites y el HUD, y solo se envían esas zonas con
+# pygame.display.update(rects). La lluvia, la nieve y las estrellas del amanecer se
+# tratan como sprites (sus rectángulos se restauran y se envían). Solo se vuelve a la
+# actualización completa cuando algo cubre la pantalla: el destello de un relámpago,
+# la carretera con desplazamiento o miles de partículas dibujadas escribiendo píxeles.
+import pygame
+from config import WIDTH, HEIGHT, LANES, LANE_WIDTH
+
+SCREEN_RECT = pygame.Rect(0, 0, WIDTH, HEIGHT)
+
+
+class DirtyRenderer:
+    """
+    Lleva la cuenta de las zonas que cambian entre frames y las presenta.
+    Argumentos:
+        enabled: Si es False, todos los frames se presentan completos con display.flip().
+    """
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.needs_full = True  # El primer frame siempre se pinta completo
+        self.full = True  # Modo del frame actual
+        self._covered = False  # Algún efecto cubrió la pantalla en este frame
+        self._previous = []  # Zonas dibujadas en el frame anterior
+        self._current = []  # Zonas dibujadas en este frame
+        self._hud_state = None
+        self._hud_rect = None
+        # Contadores de píxeles enviados a la pantalla
+        self.last_pixels = 0
+        self.total_pixels = 0
+        self.frames = 0
+        self.full_frames = 0
+
+    # Obliga a que el próximo frame se pinte completo (por ejemplo, al salir de la pausa)
+    def invalidate(self):
+        self.needs_full = True
+
+    def begin_frame(self, surface, road, *effects):
+        """
+        Decide si el frame se pinta completo o solo por zonas.
+        En modo por zonas restaura desde `road` lo dibujado en el frame anterior y el HUD.
+        effects: Efectos climáticos activos (None se ignora); cualquiera con covers_screen()
+                 verdadero fuerza el frame completo.
+        Returns: True si el llamador debe pintar el fondo completo.
+        """
+        self._covered = any(e is not None and e.covers_screen() for e in effects)
+        self.full = not self.enabled or self.needs_full or self._covered
+        self._current = []
+        if not self.full:
+            for rect in self._previous:
+                surface.blit(road, rect, rect)
+            if self._hud_rect is not None:
+                surface.blit(road, self._hud_rect, self._hud_rect)
+        return self.full
+
+    def add(self, rects):
+        """Registra las zonas dibujadas en este frame."""
+        self._current.extend(rects)
+
+    def mark_hud(self, rect, state):
+        """Registra la zona del HUD; solo se envía si su contenido (`state`) cambió."""
+        self._hud_rect = rect
+        if state != self._hud_state:
+            self._hud_state = state
+            self._current.append(rect)
+
+    def present(self):
+        """Envía el frame a la pantalla y actualiza los contadores."""
+        if self.full:
+            pygame.display.flip()
+            pixels = WIDTH * HEIGHT
+            self.full_frames += 1
+            self._hud_state = None  # Tras un frame completo el HUD se considera nuevo
+        else:
+            rects = [SCREEN_RECT.clip(r) for r in self._previous + self._current]
+            pygame.display.update(rects)
+            pixels = sum(r.width * r.height for r in rects)
+        # Tras un efecto que cubrió la pantalla hay que repintar todo una vez más
+        self.needs_full = self._covered
+        self._previous = [rect for rect in self._current if rect is not self._hud_rect]
+        self.last_pixels = pixels
+        self.total_pixels += pixels
+        self.frames += 1
+
+    def stats(self):
+        """Promedio de píxeles enviados por frame y cantidad de frames completos."""
+        average = self.total_pixels / self.frames if self.frames else 0
+        return {
+            'pixeles_por_frame': average,
+            'ahorro': 1 - average / (WIDTH * HEIGHT) if self.frames else 0,
+            'frames': self.frames,
+            'frames_completos': self.full_frames,
+        }
+
+
+# --- Capa de carretera pre-compuesta ---
+# Color de fondo de la carretera según el clima
+ROAD_COLORS = {
+    'lluvioso': (10, 10, 30),
+    'nevado': (50, 50, 80),
+    'amanecer': (10, 10, 10),  # Carretera negra, fondo de noche
+}
+DEFAULT_ROAD_COLOR = (10, 10, 30)
+LANE_LINE_COLOR = (200, 200, 200)
+DASH_LENGTH, DASH_GAP = 30, 20  # Marcas discontinuas de la carretera con desplazamiento
+
+_road_layers = {}
+
+
+def get_road_layer(weather, width=WIDTH, height=HEIGHT, lanes=LANES, dashed=False):
+    """
+    Devuelve la carretera (color del clima y líneas de carril) ya compuesta en una superficie.
+    Se construye una sola vez por combinación de (clima, ancho, alto, carriles, discontinua).
+    """
+    key = (weather.strip(), width, height, lanes, dashed)
+    layer = _road_layers.get(key)
+    if layer is None:
+        layer = pygame.Surface((width, height))
+        layer.fill(ROAD_COLORS.get(key[0], DEFAULT_ROAD_COLOR))
+        lane_width = width // lanes
+        for i in range(1, lanes):
+            x = i * lane_width
+            if dashed:
+                for y in range(0, height, DASH_LENGTH + DASH_GAP):
+                    pygame.draw.line(layer, LANE_LINE_COLOR, (x, y), (x, min(y + DASH_LENGTH, height)))
+            else:
+                pygame.draw.line(layer, LANE_LINE_COLOR, (x, 0), (x, height))
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert()
+        _road_layers[key] = layer
+    return layer
+
+
+class RoadLayer:
+    """
+    Carretera de la partida, dibujada con un solo blit.
+    Con scrolling=True las marcas son discontinuas y avanzan a la velocidad del juego
+    usando dos blits de la misma capa (arriba y abajo del desplazamiento).
+    """
+    def __init__(self, weather, scrolling=False):
+        self.scrolling = scrolling
+        self.surface = get_road_layer(weather, dashed=scrolling)
+        self.offset = 0.0
+
+    # Avanza el desplazamiento de la carretera
+    def update(self, speed):
+        if self.scrolling:
+            self.offset = (self.offset + speed) % self.surface.get_height()
+
+    # La carretera con desplazamiento cambia en toda la pantalla (impide el dibujado por zonas)
+    def covers_screen(self):
+        return self.scrolling
+
+    def draw(self, surface):
+        if not self.scrolling:
+            surface.blit(self.surface, (0, 0))
+            return
+        offset = int(self.offset)
+        surface.blit(self.surface, (0, offset))
+        surface.blit(self.surface, (0, offset - self.surface.get_height()))
@@ -0,0 +1,166 @@
+# simulacion.py
+# Núcleo de simulación sin pantalla, sin audio y sin límite de FPS.
+# Contiene la lógica de juego que antes vivía dentro de game_loop y game_loop_2p:
+# movimiento de jugadores, rivales y obstáculos, puntuación, curva de niveles y colisiones.
+import math
+import random
+import pygame
+import config
+from sprites import LaneManager, Player, blank_image
+from entidades import EntityStore, EntityGroup, RIVAL, OBSTACLE, ENTITY_SIZE
+
+# Carriles iniciales y controles por defecto según la cantidad de jugadores
+DEFAULT_START_LANES = {1: [2], 2: [2, 4]}
+DEFAULT_CONTROLS = {
+    1: [{'left': pygame.K_LEFT, 'right': pygame.K_RIGHT}],
+    2: [{'left': pygame.K_a, 'right': pygame.K_d}, {'left': pygame.K_LEFT, 'right': pygame.K_RIGHT}],
+}
+
+
+_blank = None
+
+
+def _blank_surface():
+    """Superficie de relleno (compartida) para simular sin cargar imágenes ni abrir ventana."""
+    global _blank
+    if _blank is None:
+        _blank = pygame.Surface(ENTITY_SIZE)
+    return _blank
+
+
+class SimulationState:
+    """
+    Estado completo de una partida (1 o 2 jugadores) que avanza con step().
+    Argumentos:
+        skins: Lista con una skin por jugador (None usa una superficie vacía).
+        enemy_img, obstacle_img: Imágenes de rivales y obstáculos (None usa superficies vacías).
+        start_lanes: Carriles iniciales de cada jugador.
+        controls: Teclas de control de cada jugador.
+        seed: Semilla opcional para reproducir una partida.
+    """
+    def __init__(self, skins=(None,), enemy_img=None, obstacle_img=None,
+                 start_lanes=None, controls=None, seed=None):
+        if seed is not None:
+            random.seed(seed)
+        num_players = len(skins)
+        start_lanes = start_lanes or DEFAULT_START_LANES[num_players]
+        controls = controls or DEFAULT_CONTROLS[num_players]
+        self.enemy_img = enemy_img if enemy_img is not None else _blank_surface()
+        self.obstacle_img = obstacle_img if obstacle_img is not None else _blank_surface()
+        self.lane_manager = LaneManager()
+        self.players = [
+            Player(lane, ctrl, skin if skin is not None else _blank_surface())
+            for lane, ctrl, skin in zip(start_lanes, controls, skins)
+        ]
+        self.player_group = pygame.sprite.Group(*self.players)  # Permite usar player.alive()
+        self.scores = [0] * num_players
+        self.lives = [config.LIVES] * num_players
+        self.level = 1
+        self.speed = config.get_level_speed(self.level)
+        self.points_per_car = config.get_level_points(self.level)
+        # Rivales y obstáculos viven en arreglos de NumPy; los grupos son vistas para dibujar
+        self.entities = EntityStore(self.lane_manager, self.enemy_img, self.obstacle_img)
+        self.rivals = EntityGroup(self.entities, RIVAL)
+        self.obstacles = EntityGroup(self.entities, OBSTACLE)
+        self.tick = 0
+        self.game_over = False
+        self._fill_entities()
+
+    # Añade rivales y obstáculos hasta alcanzar la cantidad del nivel actual
+    def _fill_entities(self):
+        while len(self.rivals) < config.get_enemy_count(self.level):
+            self.entities.add(RIVAL, self.speed)
+        while len(self.obstacles) < config.get_obstacle_count(self.level):
+            self.entities.add(OBSTACLE, self.speed)
+
+    # Carril de referencia para reiniciar entidades (el menor entre los jugadores)
+    def reference_lane(self):
+        return min(p.lane for p in self.players)
+
+    # Sube de nivel si la mejor puntuación supera el umbral
+    def _check_level_up(self):
+        new_level = math.floor(max(self.scores) / config.get_level_up_threshold(self.level)) + 1
+        if new_level > self.level:
+            self.level = new_level
+            self.speed = config.get_level_speed(self.level)
+            self.points_per_car = config.get_level_points(self.level)
+            self.entities.set_speed(self.speed)
+            self._fill_entities()
+            return True
+        return False
+
+    # Reparte los puntos de un rival superado al jugador más cercano a su carril
+    def _award_points(self, rival_lane):
+        if len(self.players) == 1:
+            self.scores[0] += self.points_per_car
+            return
+        distances = [abs(p.lane - rival_lane) for p in self.players]
+        closest = min(distances)
+        winners = [i for i, d in enumerate(distances) if d == closest]
+        share = self.points_per_car if len(winners) == 1 else self.points_per_car // 2
+        for i in winners:
+            self.scores[i] += share
+
+
+def step(state, inputs=None):
+    """
+    Avanza la simulación un frame.
+    Argumentos:
+        state: SimulationState a modificar.
+        inputs: Lista con un movimiento por jugador (-1 izquierda, 1 derecha, 0 nada);
+                el valor absoluto indica cuántos carriles moverse en este frame.
+    Returns:
+        Lista de eventos del frame: ('hit', jugador, posicion, choco_con_obstaculo)
+        y ('level_up', nivel).
+    """
+    events = []
+    if state.game_over:
+        return events
+    if inputs:
+        for player, move in zip(state.players, inputs):
+            for _ in range(abs(move)):
+                if move < 0:
+                    player.move_left()
+                else:
+                    player.move_right()
+
+    for player in state.players:
+        player.update()
+
+    # Todas las entidades avanzan juntas; los rivales que salieron dan puntos
+    entities = state.entities
+    for r in entities.update(state.reference_lane()).tolist():
+        state._award_points(int(entities.lane[r]))
+        if state._check_level_up():
+            events.append(('level_up', state.level))
+
+    for i, player in enumerate(state.players):
+        if not player.alive() or player.invincible:
+            continue
+        rival_hit, obstacle_hit = entities.collide(player.rect)
+        if rival_hit >= 0 or obstacle_hit >= 0:
+            events.append(('hit', i, player.rect.center, obstacle_hit >= 0))
+            state.lives[i] -= 1
+            player.set_invincible(config.INVINCIBLE_FRAMES)
+            if state.lives[i] <= 0:
+                player.kill()
+                player.image = blank_image((0, 0))
+                player.rect.x = -1000
+            if rival_hit >= 0:
+                entities.reset(rival_hit, state.reference_lane())
+            if obstacle_hit >= 0:
+                entities.reset(obstacle_hit, state.reference_lane())
+
+    state.tick += 1
+    state.game_over = all(lives <= 0 for lives in state.lives)
+    return events
+
+
+def run_session(state, policy=None, max_ticks=100000):
+    """
+    Ejecuta la partida hasta que termine o se alcance max_ticks.
+    policy: función opcional policy(state) -> inputs que decide los movimientos de cada frame.
+    """
+    while not state.game_over and state.tick < max_ticks:
+        step(state, policy(state) if policy else None)
+    return state
@@ -1,12 +1,97 @@
 import os
+from collections import OrderedDict
 import pygame
 import pygame_menu
+import config
+from miniaturas import load_thumbnail
+from catalogo import get_catalog, STORE_FOLDER
 from pygame_menu import themes
 
 # Carpetas
 SKIN_FOLDER = "SKIN_STORE"
-STORE_FOLDER = "STORE_FOLDER"
-STORE_DATA_FILE = os.path.join(STORE_FOLDER, "store_data.json")
+SKIN_CACHE_SIZE = 32  # Superficies de skins (archivo, tamaño) guardadas en memoria
+
+class SkinCache:
+    """
+    Caché LRU de skins ya decodificadas, convertidas al formato de pantalla y escaladas.
+    La clave es (archivo, tamaño); cada entrada guarda la fecha de modificación del archivo
+    para descartarla si el PNG cambia en disco.
+    """
+    def __init__(self, capacity=SKIN_CACHE_SIZE):
+        self.capacity = capacity
+        self.entries = OrderedDict()  # (archivo, tamaño) -> (mtime, superficie)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, filename, size):
+        """Devuelve la skin escalada a size; solo lee el disco la primera vez. Lanza error si no se puede cargar."""
+        key = (filename, size)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[1]
+        self.misses += 1
+        mtime, image = self.read(filename, size)
+        return self.add(filename, size, image, mtime)
+
+    def peek(self, filename, size):
+        """Devuelve la skin si ya está en la caché, o None (nunca lee el disco)."""
+        entry = self.entries.get((filename, size))
+        if entry is None:
+            return None
+        self.hits += 1
+        self.entries.move_to_end((filename, size))
+        return entry[1]
+
+    @staticmethod
+    def read(filename, size):
+        """
+        Lee la skin ya escalada a size desde la caché de miniaturas en disco (se puede
+        llamar desde otro hilo). Returns: (mtime del original, imagen).
+        """
+        path = os.path.join(SKIN_FOLDER, filename)
+        return os.path.getmtime(path), load_thumbnail(path, size)
+
+    def add(self, filename, size, image, mtime):
+        """Guarda una skin ya decodificada (por ejemplo, por la precarga) y devuelve la superficie escalada."""
+        key = (filename, size)
+        if key in self.entries:
+            return self.entries[key][1]
+        surface = image.convert_alpha() if pygame.display.get_surface() is not None else image
+        if surface.get_size() != tuple(size):
+            surface = pygame.transform.scale(surface, size)
+        self.entries[key] = (mtime, surface)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)  # Descarta la menos usada
+        return surface
+
+    def revalidate(self):
+        """Descarta las entradas cuyo archivo cambió o desapareció (un stat por archivo)."""
+        mtimes = {}
+        for (filename, size), (mtime, _) in list(self.entries.items()):
+            if filename not in mtimes:
+                path = os.path.join(SKIN_FOLDER, filename)
+                mtimes[filename] = os.path.getmtime(path) if os.path.exists(path) else None
+            if mtimes[filename] != mtime:
+                del self.entries[(filename, size)]
+
+    def invalidate(self, *filenames):
+        """Descarta todas las entradas de los archivos dados (o toda la caché si no se indica ninguno)."""
+        for key in list(self.entries):
+            if not filenames or key[0] in filenames:
+                del self.entries[key]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'tasa_aciertos': self.hits / total if total else 0,
+            'entradas': len(self.entries),
+            'bytes': sum(surface.get_width() * surface.get_height() * surface.get_bytesize()
+                         for _, surface in self.entries.values()),
+        }
 
 class SkinManager:
     def __init__(self, width, height):
@@ -18,7 +103,10 @@ class SkinManager:
         self.current_index = 0  # Skin para jugador 1
         self.current_index2 = 0  # Skin para jugador 2
         self.available_skins = []
+        self.skin_cache = SkinCache()
         self._ensure_folder()
+        self.catalog = get_catalog()  # Compartido con StoreManager
+        self.catalog.subscribe(self._on_catalog_change)
         self._load_skins()
 
     def _ensure_folder(self):
@@ -57,53 +145,25 @@ class SkinManager:
     
     
     def _load_skins(self):
-        """Carga skins desbloqueadas desde store_data.json"""
-        import json
-        self.available_skins = []
+        """Toma las skins desbloqueadas del catálogo en memoria (sin leer store_data.json)"""
         default_skins = [(1, "skin_store1.png", "skin_store2.png")]
-        
-        try:
-            if os.path.exists(STORE_DATA_FILE):
-                print(f"Intentando cargar skins desde: {STORE_DATA_FILE}")  # Debug
-                with open(STORE_DATA_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    print("Contenido del archivo JSON:", data)  # Debug
-                    
-                    if not isinstance(data, dict):
-                        raise ValueError("El archivo JSON no contiene un objeto válido")
-                    
-                    skins_data = data.get('skins', [])
-                    if not isinstance(skins_data, list):
-                        raise ValueError("La clave 'skins' debe contener una lista")
-                    
-                    for skin_item in skins_data:
-                        try:
-                            if len(skin_item) >= 5 and isinstance(skin_item[4], bool):
-                                num, preview, game, cost, unlocked = skin_item[:5]
-                                if unlocked:
-                                    self.available_skins.append((num, preview, game))
-                                    print(f"Skin cargada: {preview}")  # Debug
-                            else:
-                                print(f"Elemento de skin inválido: {skin_item}")  # Debug
-                        except Exception as e:
-                            print(f"Error procesando skin: {e}")  # Debug
-                            continue
-                            
-        except json.JSONDecodeError as e:
-            print(f"ERROR: Archivo JSON corrupto - {e}")
-        except Exception as e:
-            print(f"ERROR inesperado al cargar skins: {e}")
-        finally:
-            self.available_skins.sort(key=lambda x: x[0])
-            if not self.available_skins:
-                print("Usando skins por defecto")  # Debug
-                self.available_skins = default_skins
-            
-            # Resetear índices si son inválidos
-            if self.current_index >= len(self.available_skins):
-                self.current_index = 0
-            if self.current_index2 >= len(self.available_skins):
-                self.current_index2 = 0
+        self.available_skins = self.catalog.unlocked()
+        if not self.available_skins:
+            print("Usando skins por defecto")  # Debug
+            self.available_skins = default_skins
+
+        # Resetear índices si son inválidos
+        if self.current_index >= len(self.available_skins):
+            self.current_index = 0
+        if self.current_index2 >= len(self.available_skins):
+            self.current_index2 = 0
+
+    def _on_catalog_change(self, event, data):
+        """Una skin comprada se añade a la lista y sus imágenes se recargan"""
+        if event == 'unlocked':
+            _, preview, game = data[:3]
+            self._load_skins()
+            self.skin_cache.invalidate(preview, game)
 
     def get_current_game_skin(self, player=1) -> pygame.Surface:
         """Devuelve surface de la skin seleccionada (100×60)"""
@@ -111,27 +171,23 @@ class SkinManager:
         if not self.available_skins:
             return pygame.Surface((100, 60), pygame.SRCALPHA)
         _, _, game_file = self.available_skins[index]
-        path = os.path.join(SKIN_FOLDER, game_file)
         try:
-            img = pygame.image.load(path).convert_alpha()
-            return pygame.transform.scale(img, (100, 60))
+            return self.skin_cache.get(game_file, (100, 60))
         except Exception as e:
             print(f"Error cargando skin {game_file}: {e}")
             return pygame.Surface((100, 60), pygame.SRCALPHA)
 
-    def get_current_preview(self, player=1) -> pygame.Surface:
-        """Devuelve surface de la vista previa seleccionada (200×200)"""
+    def get_current_preview(self, player=1, size=(200, 200)) -> pygame.Surface:
+        """Devuelve surface de la vista previa seleccionada (200×200 por defecto)"""
         index = self.current_index if player == 1 else self.current_index2
         if not self.available_skins:
-            return pygame.Surface((200, 200), pygame.SRCALPHA)
+            return pygame.Surface(size, pygame.SRCALPHA)
         _, preview_file, _ = self.available_skins[index]
-        path = os.path.join(SKIN_FOLDER, preview_file)
         try:
-            img = pygame.image.load(path).convert_alpha()
-            return pygame.transform.scale(img, (200, 200))
+            return self.skin_cache.get(preview_file, size)
         except Exception as e:
             print(f"Error cargando preview {preview_file}: {e}")
-            return pygame.Surface((200, 200), pygame.SRCALPHA)
+            return pygame.Surface(size, pygame.SRCALPHA)
 
     def next(self, player=1):
         """Avanza a la siguiente skin"""
@@ -155,6 +211,10 @@ class SkinManager:
         on_return: función a llamar al pulsar 'Regresar'.
         on_select: función a llamar al seleccionar una skin.
         """
+        # Descarta de la caché las skins que cambiaron en disco desde la última vez
+        self.skin_cache.revalidate()
+        if config.SKIN_CACHE_STATS:
+            print(f"Caché de skins: {self.skin_cache.stats()}")
         # Configuración del tema (actualizado)
         theme = pygame_menu.themes.THEME_DARK.copy()
         theme.title_font = pygame_menu.font.FONT_8BIT
@@ -189,7 +249,7 @@ class SkinManager:
             align=pygame_menu.locals.ALIGN_CENTER
         )
         player1_frame.pack(
-            menu.add.surface(pygame.transform.scale(self.get_current_preview(player=1), (150, 150))),  # Reduced size
+            menu.add.surface(self.get_current_preview(player=1, size=(150, 150))),  # Reduced size
             align=pygame_menu.locals.ALIGN_CENTER
         )
         player1_frame.pack(
@@ -216,7 +276,7 @@ class SkinManager:
             align=pygame_menu.locals.ALIGN_CENTER
         )
         player2_frame.pack(
-            menu.add.surface(pygame.transform.scale(self.get_current_preview(player=2), (150, 150))),  # Reduced size
+            menu.add.surface(self.get_current_preview(player=2, size=(150, 150))),  # Reduced size
             align=pygame_menu.locals.ALIGN_CENTER
         )
         player2_frame.pack(
@@ -252,10 +312,7 @@ class SkinManager:
             player_frame = menu.get_widget(f'player{player}_frame')
             
             # Actualizar vista previa
-            preview = pygame.transform.scale(
-                self.get_current_preview(player), 
-                (150, 150)
-            )
+            preview = self.get_current_preview(player, size=(150, 150))
             player_frame.get_widgets()[2].set_surface(preview)  # Índice del widget de preview
             
             # Actualizar contador
@@ -1,13 +1,68 @@
 import pygame
 import random
-from config import WIDTH, HEIGHT, LANES, LANE_WIDTH, LIVES, get_level_up_threshold, load_scores
+import bisect
+import numpy as np
+from config import (
+    WIDTH, HEIGHT, LANES, LANE_WIDTH, LIVES, TOP_SCORES_SHOWN, get_level_up_threshold, get_top_scores,
+    BLINK_PERIOD, BLINK_VISIBLE_FRAMES,
+    LIGHTNING_MIN_INTERVAL, LIGHTNING_MAX_INTERVAL, LIGHTNING_FLASH_FRAMES, LIGHTNING_FLASH_ALPHA
+)
+
+# --- Caché de imágenes escaladas y cuadros de explosión compartidos ---
+SCALED_CACHE_SIZE = 32  # Máximo de imágenes escaladas guardadas
+_scaled_cache = {}
+scaled_cache_stats = {'hits': 0, 'misses': 0}
+_explosion_frames = None
+_blank_images = {}
+
+# Devuelve la imagen escalada al tamaño pedido, escalándola solo la primera vez
+def scaled_image(image, size):
+    if image.get_size() == size:
+        return image  # Ya viene escalada (por ejemplo, desde el registro de assets)
+    key = (id(image), size)
+    entry = _scaled_cache.get(key)
+    if entry is not None and entry[0] is image:
+        scaled_cache_stats['hits'] += 1
+        return entry[1]
+    scaled_cache_stats['misses'] += 1
+    if len(_scaled_cache) >= SCALED_CACHE_SIZE:
+        del _scaled_cache[next(iter(_scaled_cache))]  # Descarta la entrada más antigua
+    scaled = pygame.transform.scale(image, size)
+    _scaled_cache[key] = (image, scaled)  # Guarda la original para que su id no se reutilice
+    return scaled
+
+# Superficie transparente compartida de un tamaño dado (fotograma oculto del parpadeo)
+def blank_image(size):
+    image = _blank_images.get(size)
+    if image is None:
+        image = _blank_images[size] = pygame.Surface(size, pygame.SRCALPHA)
+    return image
+
+# Dibuja una sola vez los cuadros de la animación de explosión
+def get_explosion_frames():
+    global _explosion_frames
+    if _explosion_frames is None:
+        _explosion_frames = []
+        for i in range(1, 6):
+            img = pygame.Surface((80, 80), pygame.SRCALPHA)
+            pygame.draw.circle(img, (255, 255, 0, 200), (40, 40), 40 - (i*5))
+            pygame.draw.circle(img, (255, 0, 0, 200), (40, 40), 20 - (i*3))
+            _explosion_frames.append(img)
+    return _explosion_frames
 
 # Clase Player maneja el sprite del jugador, su movimiento e invencibilidad
 class Player(pygame.sprite.Sprite):
-    def __init__(self, initial_lane, controls, skin):
+    SIZE = (LANE_WIDTH-20, 60)
+
+    def __init__(self, initial_lane, controls, skin, blink_period=BLINK_PERIOD, blink_visible=BLINK_VISIBLE_FRAMES):
         super().__init__()
         self.original_image = skin  # Almacena la imagen original del skin del jugador
-        self.image = pygame.transform.scale(self.original_image, (LANE_WIDTH-20, 60))  # Escala la imagen para ajustarse al carril
+        # Imagen escalada (una vez por skin) y fotograma oculto del parpadeo, ambos compartidos
+        self.visible_image = scaled_image(self.original_image, self.SIZE)
+        self.hidden_image = blank_image(self.SIZE)
+        self.blink_period = blink_period
+        self.blink_visible = blink_visible
+        self.image = self.visible_image
         self.lane = initial_lane  # Establece el carril inicial
         self.rect = self.image.get_rect()  # Obtiene el rectángulo para detección de colisiones
         self.rect.centerx = self.lane * LANE_WIDTH + LANE_WIDTH // 2  # Centra al jugador en el carril
@@ -41,25 +96,28 @@ class Player(pygame.sprite.Sprite):
             self.invincible_timer -= 1
             if self.invincible_timer <= 0:
                 self.invincible = False
-                self.image = pygame.transform.scale(self.original_image, (LANE_WIDTH-20, 60))  # Restaura la imagen original
-            elif self.invincible_timer % 10 < 5:
-                self.image = pygame.transform.scale(self.original_image, (LANE_WIDTH-20, 60))  # Fotograma visible
+                self.image = self.visible_image  # Restaura la imagen original
+            elif self.invincible_timer % self.blink_period < self.blink_visible:
+                self.image = self.visible_image  # Fotograma visible
             else:
-                self.image = pygame.Surface((LANE_WIDTH-20, 60), pygame.SRCALPHA)  # Fotograma transparente para parpadeo
+                self.image = self.hidden_image  # Fotograma transparente para parpadeo
 
     # Establece la invencibilidad por una duración específica
     def set_invincible(self, duration):
         self.invincible = True
         self.invincible_timer = duration
 
-# Clase LaneManager gestiona la ocupación de carriles y la selección aleatoria
+# Clase LaneManager gestiona la ocupación de carriles, la selección aleatoria
+# y un índice de entidades por carril (ordenadas por y) para detectar colisiones
 class LaneManager:
     def __init__(self):
         self.reset()  # Inicializa la ocupación de carriles
 
-    # Reinicia todos los carriles a no ocupados
+    # Reinicia todos los carriles a no ocupados y vacía el índice por carril
     def reset(self):
         self.occupied = {lane: None for lane in range(LANES)}  # Diccionario para rastrear ocupación de carriles
+        self.buckets = {lane: [] for lane in range(LANES)}  # Entidades de cada carril, de arriba hacia abajo
+        self.entity_lane = {}  # Carril actual de cada entidad indexada
 
     # Obtiene un carril aleatorio
     def get_random_lane(self):
@@ -84,77 +142,40 @@ class LaneManager:
         if 0 <= lane < LANES:
             self.occupied[lane] = None
 
-# Clase Rival representa los autos enemigos que se mueven hacia abajo
-class Rival(pygame.sprite.Sprite):
-    def __init__(self, speed, lane_manager, enemy_img):
-        super().__init__()
-        self.speed = speed  # Velocidad de movimiento del rival
-        self.lane_manager = lane_manager  # Referencia al administrador de carriles
-        self.lane = -1  # Carril inicial (se establece en reset)
-        self.image = pygame.transform.scale(enemy_img, (LANE_WIDTH-20, 60))  # Escala la imagen del rival
-        self.rect = self.image.get_rect()  # Obtiene el rectángulo para colisiones
-        self.reset()  # Inicializa la posición
-
-    # Reinicia el rival a un carril aleatorio y posición fuera de pantalla
-    def reset(self, player_lane=None):
-        if player_lane is None:
-            player_lane = LANES // 2
-        self.lane = self.lane_manager.get_random_lane_avoiding(player_lane)
-        self.lane_manager.occupy_lane(self.lane, 'enemy')
-        self.rect.centerx = self.lane * LANE_WIDTH + LANE_WIDTH // 2
-        self.rect.y = -self.rect.height - random.randint(0, 100)
-
-    # Actualiza la posición del rival, reinicia si sale de la pantalla
-    def update(self, player_lane=None):
-        self.rect.y += self.speed
-        if self.rect.top > HEIGHT:
-            self.lane_manager.free_lane(self.lane)
-            self.reset(player_lane)
-            return True  # Indica que el rival salió de la pantalla
-        return False
-
-# Clase Obstacle representa obstáculos estáticos en los carriles
-class Obstacle(pygame.sprite.Sprite):
-    def __init__(self, speed, lane_manager, image, debug=False):
-        super().__init__()
-        self.image = pygame.transform.scale(image, (LANE_WIDTH-20, 60))  # Escala la imagen del obstáculo
-        self.rect = self.image.get_rect()
-        if debug:
-            print(f"Obstáculo inicializado con tamaño de imagen: {self.image.get_size()}, rect: {self.rect}")
-        self.lane_manager = lane_manager
-        self.lane = self.lane_manager.get_random_lane()  # Asigna un carril aleatorio
-        self.rect.centerx = self.lane * LANE_WIDTH + LANE_WIDTH // 2
-        self.rect.bottom = 0
-        self.speed = speed
-
-    # Actualiza la posición del obstáculo, reinicia si sale de la pantalla
-    def update(self, player_lane=None):
-        self.rect.y += self.speed
-        if self.rect.top > HEIGHT:
-            self.lane_manager.free_lane(self.lane)
-            self.reset(player_lane)
-            return True
-        return False
-
-    # Reinicia el obstáculo a un nuevo carril aleatorio
-    def reset(self, player_lane):
-        self.lane = self.lane_manager.get_random_lane_avoiding(player_lane)
-        self.rect.centerx = self.lane * LANE_WIDTH + LANE_WIDTH // 2
-        self.rect.bottom = 0
+    # Coloca una entidad en el índice de su carril, ordenada por su posición y actual.
+    # Todas las entidades avanzan a la misma velocidad, así que el orden solo cambia
+    # cuando una entidad se reinicia o cambia de carril.
+    def place_entity(self, entity, lane, key):
+        self.remove_entity(entity)
+        if 0 <= lane < LANES:
+            bisect.insort(self.buckets[lane], entity, key=key)
+            self.entity_lane[entity] = lane
+
+    # Quita una entidad del índice por carril
+    def remove_entity(self, entity):
+        lane = self.entity_lane.pop(entity, None)
+        if lane is not None:
+            self.buckets[lane].remove(entity)
+
+    # Entidades de un carril, de arriba (y menor) hacia abajo
+    def entities_in_lane(self, lane):
+        return self.buckets.get(lane, ())
 
 # Clase Explosion maneja el efecto visual de las colisiones
 class Explosion(pygame.sprite.Sprite):
-    def __init__(self, pos):
+    def __init__(self, pos, pool=None):
         super().__init__()
-        self.images = []
-        for i in range(1, 6):
-            img = pygame.Surface((80, 80), pygame.SRCALPHA)
-            pygame.draw.circle(img, (255, 255, 0, 200), (40, 40), 40 - (i*5))
-            pygame.draw.circle(img, (255, 0, 0, 200), (40, 40), 20 - (i*3))
-            self.images.append(img)
+        self.images = get_explosion_frames()  # Cuadros compartidos por todas las explosiones
+        self.pool = pool  # Pool al que vuelve la explosión al terminar
+        self.image = self.images[0]
+        self.rect = self.image.get_rect(center=pos)
+        self.respawn(pos)
+
+    # Reinicia la animación en una nueva posición (usado al reciclar desde el pool)
+    def respawn(self, pos):
         self.index = 0
         self.image = self.images[self.index]
-        self.rect = self.image.get_rect(center=pos)
+        self.rect.center = pos
         self.counter = 0
 
     # Actualiza la animación de la explosión
@@ -166,36 +187,142 @@ class Explosion(pygame.sprite.Sprite):
             self.index += 1
             if self.index >= len(self.images):
                 self.kill()
+                if self.pool is not None:
+                    self.pool.release(self)
             else:
                 self.image = self.images[self.index]
 
-# Clase Rain representa partículas de lluvia para el efecto climático
-class Rain(pygame.sprite.Sprite):
+# Clase ExplosionPool recicla explosiones terminadas en lugar de crear nuevas
+class ExplosionPool:
     def __init__(self):
-        super().__init__()
-        self.image = pygame.Surface((2, 10), pygame.SRCALPHA)
-        pygame.draw.line(self.image, (150, 150, 255, 200), (1, 0), (1, 10), 2)  # Dibuja una gota de lluvia
-        self.rect = self.image.get_rect()
-        self.rect.x = random.randint(0, WIDTH)
-        self.rect.y = random.randint(-HEIGHT, 0)
-        self.speed = random.randint(10, 15)
-
-    # Actualiza la posición de la gota, reinicia si sale de la pantalla
+        self.free = []  # Explosiones terminadas listas para reutilizarse
+        self.hits = 0  # Explosiones recicladas
+        self.misses = 0  # Explosiones creadas porque el pool estaba vacío
+
+    # Obtiene una explosión en pos (reciclada si es posible) y la añade al grupo
+    def spawn(self, pos, group):
+        if self.free:
+            explosion = self.free.pop()
+            explosion.respawn(pos)
+            self.hits += 1
+        else:
+            explosion = Explosion(pos, pool=self)
+            self.misses += 1
+        group.add(explosion)
+        return explosion
+
+    # Devuelve una explosión terminada al pool
+    def release(self, explosion):
+        self.free.append(explosion)
+
+    # Devuelve al pool las explosiones que siguen animándose (al terminar o reiniciar la partida)
+    def release_all(self, group):
+        for explosion in group.sprites():
+            explosion.kill()
+            if explosion.pool is self:
+                self.release(explosion)
+
+    # Contadores del pool
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'libres': len(self.free)}
+
+# Pool compartido por los modos de uno y dos jugadores (sobrevive a los reinicios)
+explosion_pool = ExplosionPool()
+
+# Clase ParticleSystem mueve miles de partículas (lluvia, nieve) con arreglos de NumPy
+# y las dibuja en lote: surface.blits con una imagen compartida o, para cantidades
+# grandes, escribiendo directamente los píxeles de la pantalla.
+class ParticleSystem:
+    PIXEL_THRESHOLD = 1000  # A partir de esta cantidad se dibuja escribiendo píxeles
+
+    def __init__(self, image, count, min_speed, max_speed, background=(10, 10, 30)):
+        self.image = image  # Imagen compartida por todas las partículas
+        self.count = count
+        self.rng = np.random.default_rng()
+        self.x = self.rng.integers(0, WIDTH, count, endpoint=True)
+        self.y = self.rng.integers(-HEIGHT, 0, count, endpoint=True)
+        self.speed = self.rng.integers(min_speed, max_speed, count, endpoint=True)
+        # Píxeles visibles de la imagen y su color mezclado con el fondo (modo de píxeles)
+        alpha = pygame.surfarray.array_alpha(image)
+        self.offsets = np.argwhere(alpha > 0)
+        weight = alpha[alpha > 0][:, None] / 255.0
+        rgb = pygame.surfarray.array3d(image)[alpha > 0]
+        blended = (rgb * weight + np.array(background) * (1 - weight)).mean(axis=0)
+        self.pixel_color = tuple(int(c) for c in blended)
+
+    # Actualiza la posición de todas las partículas, reinicia las que salen de la pantalla
     def update(self):
-        self.rect.y += self.speed
-        if self.rect.top > HEIGHT:
-            self.rect.x = random.randint(0, WIDTH)
-            self.rect.y = random.randint(-HEIGHT, 0)
+        self.y += self.speed
+        wrapped = self.y > HEIGHT
+        n = int(np.count_nonzero(wrapped))
+        if n:
+            self.x[wrapped] = self.rng.integers(0, WIDTH, n, endpoint=True)
+            self.y[wrapped] = self.rng.integers(-HEIGHT, 0, n, endpoint=True)
+
+    # Solo en modo de píxeles (miles de partículas) se pinta la pantalla completa;
+    # con pocas partículas el dibujado por zonas usa los rectángulos que devuelve draw()
+    def covers_screen(self):
+        return self.count >= self.PIXEL_THRESHOLD
+
+    # Dibuja todas las partículas visibles en una sola pasada; devuelve las zonas dibujadas
+    def draw(self, surface):
+        visible = self.y > -self.image.get_height()
+        xs, ys = self.x[visible], self.y[visible]
+        if self.count >= self.PIXEL_THRESHOLD:
+            try:
+                self._draw_pixels(surface, xs, ys)
+                return []
+            except ValueError:
+                pass  # Formato de superficie sin acceso directo a píxeles: se usan blits
+        image = self.image
+        return surface.blits([(image, pos) for pos in zip(xs.tolist(), ys.tolist())])
+
+    # Estampa la forma de la partícula escribiendo directamente en los píxeles de la superficie
+    def _draw_pixels(self, surface, xs, ys):
+        stamp_pixels(surface, self.offsets, xs, ys, surface.map_rgb(self.pixel_color))
+
+# Escribe una forma (lista de desplazamientos dx, dy) en cada posición xs, ys con el color dado.
+# colors puede ser un solo color mapeado o un arreglo con un color por posición.
+def stamp_pixels(surface, offsets, xs, ys, colors):
+    width, height = surface.get_size()
+    per_item = isinstance(colors, np.ndarray)
+    pixels = pygame.surfarray.pixels2d(surface)
+    try:
+        for dx, dy in offsets:
+            px, py = xs + dx, ys + dy
+            inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+            pixels[px[inside], py[inside]] = colors[inside] if per_item else colors
+    finally:
+        del pixels  # Libera el bloqueo de la superficie
+
+# Clase Rain representa las gotas de lluvia del efecto climático
+class Rain(ParticleSystem):
+    def __init__(self, count=50):
+        image = pygame.Surface((2, 10), pygame.SRCALPHA)
+        pygame.draw.line(image, (150, 150, 255, 200), (1, 0), (1, 10), 2)  # Dibuja una gota de lluvia
+        super().__init__(image, count, 10, 15, background=(10, 10, 30))
 
 # Clase Lightning maneja el efecto de relámpago
 class Lightning:
-    def __init__(self):
-        self.timer = random.randint(120, 600)  # Frames entre relámpagos (2-10 segundos a 60 FPS)
-        self.flash_duration = 10  # Duración del destello en frames
-        self.flash_alpha = 100  # Alfa máximo para el destello (semi-transparente)
-        self.flash_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    def __init__(self, min_interval=LIGHTNING_MIN_INTERVAL, max_interval=LIGHTNING_MAX_INTERVAL,
+                 flash_duration=LIGHTNING_FLASH_FRAMES, flash_alpha=LIGHTNING_FLASH_ALPHA):
+        self.min_interval = min_interval  # Frames mínimos entre relámpagos
+        self.max_interval = max_interval  # Frames máximos entre relámpagos
+        self.timer = random.randint(min_interval, max_interval)
+        self.flash_duration = flash_duration  # Duración del destello en frames
+        self.flash_alpha = flash_alpha  # Alfa máximo para el destello (semi-transparente)
+        # Rampa de desvanecimiento precalculada: alfa según los frames restantes del destello
+        # (LIGHTNING_FLASH_FRAMES = 0 desactiva el destello: la rampa queda en [0])
+        self.alpha_ramp = [int(flash_alpha * (c / max(flash_duration, 1))) for c in range(flash_duration + 1)]
+        # Superficie blanca y opaca creada una sola vez; el desvanecimiento usa alfa por superficie
+        # (set_alpha), mucho más barato que rellenar una superficie SRCALPHA en cada frame
+        self.flash_surface = pygame.Surface((WIDTH, HEIGHT))
+        if pygame.display.get_surface() is not None:
+            self.flash_surface = self.flash_surface.convert()
+        self.flash_surface.fill((255, 255, 255))
         self.is_flashing = False
         self.flash_counter = 0
+        self.alpha = 0
 
     # Actualiza el temporizador y el efecto de destello
     def update(self, music_manager):
@@ -204,22 +331,70 @@ class Lightning:
             self.is_flashing = True
             self.flash_counter = self.flash_duration
             music_manager.play_sound('thunder_sound.mp3')  # Reproduce sonido de trueno
-            self.timer = random.randint(120, 600)  # Reinicia temporizador
+            self.timer = random.randint(self.min_interval, self.max_interval)  # Reinicia temporizador
         if self.is_flashing:
             self.flash_counter -= 1
             if self.flash_counter <= 0:
                 self.is_flashing = False
-            # Calcula alfa para efecto de desvanecimiento
-            alpha = int(self.flash_alpha * (self.flash_counter / self.flash_duration))
-            self.flash_surface.fill((255, 255, 255, alpha))
+            self.alpha = self.alpha_ramp[max(self.flash_counter, 0)]  # Alfa del efecto de desvanecimiento
+
+    # Indica si el destello cubre la pantalla (impide el dibujado por zonas)
+    def covers_screen(self):
+        return self.is_flashing
 
     # Dibuja el destello de relámpago en pantalla
     def draw(self, surface):
         if self.is_flashing:
+            self.flash_surface.set_alpha(self.alpha)
             surface.blit(self.flash_surface, (0, 0))
 
-# Clase ScoreDisplay maneja la interfaz de usuario (HUD) para un jugador
+# Clase HudText guarda un texto del HUD ya renderizado y lo renderiza solo cuando cambia su valor
+class HudText:
+    def __init__(self, font, template, color, counter):
+        self.font = font
+        self.template = template  # Formato del texto, por ejemplo "Nivel: {}"
+        self.color = color
+        self.counter = counter  # HudCounter compartido con el HUD dueño
+        self.value = None
+        self.image = None
+
+    # Devuelve la superficie del texto para este valor (renderiza solo si cambió)
+    def get(self, *value):
+        if value != self.value or self.image is None:
+            self.value = value
+            self.image = self.font.render(self.template.format(*value), True, self.color)
+            self.counter.renders += 1
+        return self.image
+
+# Clase HudCounter cuenta los renders del HUD (totales y del último frame)
+class HudCounter:
+    def __init__(self):
+        self.frames = 0
+        self.renders = 0
+        self.last_frame = 0
+        self.renders_before = 0  # Renders al terminar el frame anterior
+
+    # Cierra el frame: calcula cuántos renders hubo en él
+    def frame_done(self):
+        self.frames += 1
+        self.last_frame = self.renders - self.renders_before
+        self.renders_before = self.renders
+
+    # Renders totales, promedio por frame y los del último frame
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'renders': self.renders,
+            'renders_por_frame': self.renders / self.frames if self.frames else 0,
+            'ultimo_frame': self.last_frame,
+        }
+
+# Clase ScoreDisplay maneja el HUD del modo de un jugador.
+# El panel translúcido, los textos y la barra de progreso se guardan ya renderizados;
+# solo se reconstruye la parte cuyo valor cambió, el resto del frame son blits.
 class ScoreDisplay:
+    BAR_WIDTH, BAR_HEIGHT = 100, 10
+
     def __init__(self, life_icon_img):
         self.score1 = 0
         self.score2 = 0
@@ -228,8 +403,18 @@ class ScoreDisplay:
         self.font = pygame.font.SysFont('Arial', 24)
         self.big_font = pygame.font.SysFont('Arial', 36, bold=True)
         #TODO: Cargar puntuaciones altas para mostrar en el HUD
-        self.high_scores = load_scores()
+        self.high_scores = get_top_scores(TOP_SCORES_SHOWN)
         self.life_icon_img = pygame.transform.scale(life_icon_img, (30, 30))  # Escala el ícono de vida
+        self.rect = pygame.Rect(0, 0, WIDTH, 100)  # Zona que ocupa el HUD
+        self.panel = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.panel.fill((0, 0, 0, 150))  # Fondo semi-transparente para el HUD
+        self.counter = HudCounter()
+        self.score_text = HudText(self.big_font, "J1: {}", (255, 255, 255), self.counter)
+        self.level_text = HudText(self.font, "Nivel: {}", (200, 200, 200), self.counter)
+        self.threshold_level = None
+        self.threshold = None
+        self.bar = pygame.Surface((self.BAR_WIDTH, self.BAR_HEIGHT))
+        self.bar_fill = None
 
     # Actualiza puntuación, nivel y vidas
     def update(self, score1, score2, level, lives):
@@ -238,21 +423,33 @@ class ScoreDisplay:
         self.level = level
         self.lives = lives
 
+    # Barra de progreso hacia el siguiente nivel (se redibuja solo si cambia su largo)
+    def _progress_bar(self):
+        if self.threshold_level != self.level:
+            self.threshold_level = self.level
+            self.threshold = get_level_up_threshold(self.level)
+        progress = (max(self.score1, self.score2) % self.threshold) / self.threshold
+        fill = int(self.BAR_WIDTH * progress)
+        if fill != self.bar_fill:
+            self.bar_fill = fill
+            self.bar.fill((100, 100, 100))  # Fondo de barra de progreso
+            self.bar.fill((0, 255, 0), (0, 0, fill, self.BAR_HEIGHT))  # Barra de progreso
+            self.counter.renders += 1
+        return self.bar
+
     # Dibuja elementos del HUD (puntuación, nivel, vidas, barra de progreso)
     def draw(self, surface):
-        hud = pygame.Surface((WIDTH, 100), pygame.SRCALPHA)
-        hud.fill((0, 0, 0, 150))  # Fondo semi-transparente para el HUD
-        surface.blit(hud, (0, 0))
-        score1_text = self.big_font.render(f"J1: {self.score1}", True, (255, 255, 255))
-        surface.blit(score1_text, (20, 20))
-        level_text = self.font.render(f"Nivel: {self.level}", True, (200, 200, 200))
-        surface.blit(level_text, (WIDTH - 120, 20))
+        surface.blit(self.panel, (0, 0))
+        surface.blit(self.score_text.get(self.score1), (20, 20))
+        surface.blit(self.level_text.get(self.level), (WIDTH - 120, 20))
         for i in range(self.lives):
             surface.blit(self.life_icon_img, (20 + i * 40, 60))
-        threshold = get_level_up_threshold(self.level)
-        progress = (max(self.score1, self.score2) % threshold) / threshold
-        pygame.draw.rect(surface, (100, 100, 100), (WIDTH - 120, 60, 100, 10))  # Fondo de barra de progreso
-        pygame.draw.rect(surface, (0, 255, 0), (WIDTH - 120, 60, int(100 * progress), 10))  # Barra de progreso
+        surface.blit(self._progress_bar(), (WIDTH - 120, 60))
+        self.counter.frame_done()
+
+    # Renders del HUD: totales, promedio por frame y los del último frame
+    def stats(self):
+        return self.counter.stats()
 
 # Clase ScoreDisplay2 maneja el HUD para el modo de dos jugadores
 class ScoreDisplay2:
@@ -263,6 +460,11 @@ class ScoreDisplay2:
         self.lives1 = 0
         self.lives2 = 0
         self.font = pygame.font.SysFont(None, 36)
+        self.rect = pygame.Rect(0, 0, WIDTH, 90)  # Zona que ocupa el HUD
+        self.counter = HudCounter()
+        self.text1 = HudText(self.font, "J1: {}  Vidas: {}", (255, 255, 255), self.counter)
+        self.text2 = HudText(self.font, "J2: {}  Vidas: {}", (255, 255, 255), self.counter)
+        self.level_text = HudText(self.font, "Nivel: {}", (255, 255, 0), self.counter)
 
     # Actualiza puntuaciones, nivel y vidas de ambos jugadores
     def update(self, score1, score2, level, lives1, lives2):
@@ -272,63 +474,89 @@ class ScoreDisplay2:
         self.lives1 = lives1
         self.lives2 = lives2
 
-    # Dibuja elementos del HUD para ambos jugadores
+    # Dibuja elementos del HUD para ambos jugadores (textos ya renderizados si no cambiaron)
     def draw(self, surface):
-        text1 = self.font.render(f"J1: {self.score1}  Vidas: {self.lives1}", True, (255, 255, 255))
-        text2 = self.font.render(f"J2: {self.score2}  Vidas: {self.lives2}", True, (255, 255, 255))
-        level_text = self.font.render(f"Nivel: {self.level}", True, (255, 255, 0))
-        surface.blit(text1, (20, 10))
-        surface.blit(text2, (20, 50))
-        surface.blit(level_text, (WIDTH - 150, 10))
+        surface.blit(self.text1.get(self.score1, self.lives1), (20, 10))
+        surface.blit(self.text2.get(self.score2, self.lives2), (20, 50))
+        surface.blit(self.level_text.get(self.level), (WIDTH - 150, 10))
+        self.counter.frame_done()
+
+    # Renders del HUD: totales, promedio por frame y los del último frame
+    def stats(self):
+        return self.counter.stats()
 
     #TODO: Implementar barra de progreso o visualización de puntuaciones altas para modo de dos jugadores
 
-# Clase Snow representa partículas de nieve para el efecto climático
-class Snow(pygame.sprite.Sprite):
-    def __init__(self):
-        super().__init__()
-        self.image = pygame.Surface((4, 4), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (255, 255, 255, 200), (2, 2), 2)  # Dibuja un copo de nieve
-        self.rect = self.image.get_rect()
-        self.rect.x = random.randint(0, WIDTH)
-        self.rect.y = random.randint(-HEIGHT, 0)
-        self.speed = random.randint(3, 7)  # Más lento que la lluvia para simular nieve
-
-    # Actualiza la posición del copo, reinicia si sale de la pantalla
-    def update(self):
-        self.rect.y += self.speed
-        if self.rect.top > HEIGHT:
-            self.rect.x = random.randint(0, WIDTH)
-            self.rect.y = random.randint(-HEIGHT, 0)
+# Clase Snow representa los copos de nieve del efecto climático
+class Snow(ParticleSystem):
+    def __init__(self, count=50):
+        image = pygame.Surface((4, 4), pygame.SRCALPHA)
+        pygame.draw.circle(image, (255, 255, 255, 200), (2, 2), 2)  # Dibuja un copo de nieve
+        super().__init__(image, count, 3, 7, background=(50, 50, 80))  # Más lento que la lluvia para simular nieve
 
-# Clase Sunrise maneja el efecto climático de amanecer con estrellas fugaces
+# Clase Sunrise maneja el efecto climático de amanecer con estrellas fugaces.
+# Las estrellas viven en arreglos de NumPy y se dibujan con sprites pre-renderizados
+# por nivel de brillo o, si son muchas, escribiendo directamente los píxeles.
 class Sunrise:
-    def __init__(self):
-        #TODO: Configurar gradiente y cantidad de estrellas según ajustes del juego
-        self.gradient_surface = pygame.Surface((WIDTH, HEIGHT))
-        self.gradient_surface.fill((10, 10, 10))  # Carretera negra, fondo de noche
+    PIXEL_THRESHOLD = 1000  # A partir de esta cantidad de estrellas se dibuja escribiendo píxeles
+    BRIGHTNESS_STEP = 5  # Agrupa brillos cercanos para reutilizar el mismo sprite
+
+    def __init__(self, star_count=60):
+        # El fondo de noche forma parte de la capa de carretera (renderizado.get_road_layer)
         # Inicializa estrellas fugaces (x, y, velocidad, brillo)
-        self.stars = []
-        for _ in range(60):
-            x = random.randint(0, WIDTH)
-            y = random.randint(-HEIGHT, 0)
-            speed = random.uniform(1, 3)
-            brightness = random.randint(180, 255)
-            self.stars.append([x, y, speed, brightness])
+        self.count = star_count
+        self.rng = np.random.default_rng()
+        self.x = self.rng.integers(0, WIDTH, star_count, endpoint=True)
+        self.y = self.rng.integers(-HEIGHT, 0, star_count, endpoint=True).astype(np.float64)
+        self.speed = self.rng.uniform(1, 3, star_count)
+        self.brightness = self._random_brightness(star_count)
+        # Un sprite de estrella por nivel de brillo (centrado en (2, 2), radio 2)
+        self.star_images = {}
+        for level in range(180 // self.BRIGHTNESS_STEP, 255 // self.BRIGHTNESS_STEP + 1):
+            b = level * self.BRIGHTNESS_STEP
+            img = pygame.Surface((5, 5), pygame.SRCALPHA)
+            pygame.draw.circle(img, (b, b, b), (2, 2), 2)
+            self.star_images[level] = img
+        self.offsets = np.argwhere(pygame.surfarray.array_alpha(self.star_images[min(self.star_images)]) > 0) - 2
+        self._palette = None  # Colores mapeados al formato de la pantalla (modo de píxeles)
+        self._palette_masks = None
+
+    # Niveles de brillo aleatorios (180-255) agrupados de BRIGHTNESS_STEP en BRIGHTNESS_STEP
+    def _random_brightness(self, n):
+        return self.rng.integers(180, 255, n, endpoint=True) // self.BRIGHTNESS_STEP
 
     # Actualiza posiciones de las estrellas
     def update(self, music_manager):
-        for star in self.stars:
-            star[1] += star[2]  # Mueve la estrella hacia abajo
-            if star[1] > HEIGHT:
-                star[1] = random.randint(-50, -10)  # Reinicia en la parte superior
-                star[0] = random.randint(0, WIDTH)
-                star[2] = random.uniform(1, 3)
-                star[3] = random.randint(180, 255)
-
-    # Dibuja gradiente y estrellas fugaces
+        self.y += self.speed  # Mueve las estrellas hacia abajo
+        wrapped = self.y > HEIGHT
+        n = int(np.count_nonzero(wrapped))
+        if n:
+            # Reinicia en la parte superior
+            self.y[wrapped] = self.rng.integers(-50, -10, n, endpoint=True)
+            self.x[wrapped] = self.rng.integers(0, WIDTH, n, endpoint=True)
+            self.speed[wrapped] = self.rng.uniform(1, 3, n)
+            self.brightness[wrapped] = self._random_brightness(n)
+
+    # Como las partículas: solo miles de estrellas (modo de píxeles) obligan al frame completo
+    def covers_screen(self):
+        return self.count >= self.PIXEL_THRESHOLD
+
+    # Dibuja las estrellas fugaces; devuelve las zonas dibujadas
     def draw(self, surface):
-        surface.blit(self.gradient_surface, (0, 0))
-        for x, y, speed, brightness in self.stars:
-            color = (brightness, brightness, brightness)
-            pygame.draw.circle(surface, color, (int(x), int(y)), 2)
\ No newline at end of file
+        visible = self.y > -3
+        xs = self.x[visible]
+        ys = self.y[visible].astype(np.int64)
+        levels = self.brightness[visible]
+        if self.count >= self.PIXEL_THRESHOLD:
+            try:
+                if self._palette_masks != surface.get_masks():
+                    self._palette = np.array([surface.map_rgb((l * self.BRIGHTNESS_STEP,) * 3)
+                                              for l in range(max(self.star_images) + 1)])
+                    self._palette_masks = surface.get_masks()
+                stamp_pixels(surface, self.offsets, xs, ys, self._palette[levels])
+                return []
+            except ValueError:
+                pass  # Formato de superficie sin acceso directo a píxeles: se usan blits
+        images = self.star_images
+        return surface.blits([(images[l], (x - 2, y - 2))
+                              for l, x, y in zip(levels.tolist(), xs.tolist(), ys.tolist())])
@@ -0,0 +1,35 @@
+# test_diario_tienda.py
+# Recuperación del diario de la tienda tras un corte durante la escritura.
+import json
+from diario_tienda import StoreJournal, JOURNAL_NAME
+
+
+def _journal(tmp_path):
+    return StoreJournal(str(tmp_path / "store_data.json"), lambda: {'points': 0, 'skins': [], 'seq': 0})
+
+
+def test_torn_tail_is_truncated_and_next_record_survives(tmp_path):
+    log = tmp_path / JOURNAL_NAME
+    log.write_text(json.dumps({'op': 'points', 'amount': 5, 'seq': 1}) + '\n'
+                   + '{"op": "poi', encoding='utf-8')
+
+    journal = _journal(tmp_path)
+    records = journal.recover(0)
+    assert [r['seq'] for r in records] == [1]
+    assert journal.discarded
+    journal.append({'op': 'points', 'amount': 100})
+    journal.flush()
+
+    records = _journal(tmp_path).recover(0)
+    assert [(r['seq'], r['amount']) for r in records] == [(1, 5), (2, 100)]
+
+
+def test_clean_journal_is_left_untouched(tmp_path):
+    log = tmp_path / JOURNAL_NAME
+    content = json.dumps({'op': 'points', 'amount': 5, 'seq': 1}) + '\n'
+    log.write_text(content, encoding='utf-8')
+
+    journal = _journal(tmp_path)
+    assert len(journal.recover(0)) == 1
+    assert not journal.discarded
+    assert log.read_text(encoding='utf-8') == content
@@ -1,15 +1,19 @@
 # tienda.py
 # Gestiona la tienda del juego donde los jugadores compran skins con puntos acumulados.
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pygame
 import pygame_menu
 from pygame_menu import themes
 from funciones_botones import create_buy_button, create_return_button
+from catalogo import get_catalog, STORE_FOLDER, STORE_DATA_FILE
 
-# Carpeta para datos de la tienda y skins
-STORE_FOLDER = "STORE_FOLDER"
+# Carpeta de skins (los datos de la tienda viven en catalogo.StoreCatalog)
 SKIN_FOLDER = "SKIN_STORE"
-STORE_DATA_FILE = os.path.join(STORE_FOLDER, "store_data.json")
+STORE_PAGE_SIZE = 4  # Skins por página: solo existen widgets para estas casillas
+PREVIEW_SIZE = (100, 100)
+MESSAGE_SECONDS = 2.0  # Tiempo que se muestra el mensaje de compra
 
 class StoreManager:
     def __init__(self, width, height, skin_manager):
@@ -22,10 +26,29 @@ class StoreManager:
         self.width = width
         self.height = height
         self.skin_manager = skin_manager
-        self.points = 0
-        self.available_skins = []
         self._ensure_folder()
-        self._load_store_data()
+        self.catalog = get_catalog()  # Compartido con SkinManager; store_data.json se lee una sola vez
+        self.catalog.subscribe(self._on_catalog_change)
+        self._menu = None  # Menú de la tienda; se construye una vez y se reutiliza
+        self._page = 0
+        self._slots = [None] * STORE_PAGE_SIZE  # Número de skin mostrado en cada casilla
+        self._thumb_pool = None
+        self._thumb_jobs = {}  # archivo -> future con (mtime, imagen decodificada)
+        self._placeholder = None
+        self._message_until = 0
+        # Solo se reescribe store_data.json si faltaba o hubo que reparar la instantánea o el
+        # diario; si no, el diario sigue acumulando transacciones hasta la próxima compactación
+        if self.catalog.repaired:
+            self.save_store_data()
+            self.catalog.repaired = False
+
+    @property
+    def points(self):
+        return self.catalog.points
+
+    @property
+    def available_skins(self):
+        return self.catalog.skins
 
     def _ensure_folder(self):
         """Crea carpetas con verificación de permisos"""
@@ -48,104 +71,18 @@ class StoreManager:
             print(f"ERROR configurando carpetas: {e}")
             raise
 
-    def _load_store_data(self):
-        """Carga datos de la tienda con validación robusta"""
-        import json
-        default_skins = [
-            (1, "skin_store1.png", "skin_store1.png", 0, True),
-            (2, "skin_store2.png", "skin_store2.png", 0, True),
-            (3, "skin_store3.png", "skin_store3.png", 500, False),
-            (4, "skin_store4.png", "skin_store4.png", 500, False),
-            (5, "skin_store5.png", "skin_store5.png", 500, False)
-        ]
-
-        try:
-            if os.path.exists(STORE_DATA_FILE):
-                print(f"Intentando cargar datos de tienda desde: {STORE_DATA_FILE}")
-                
-                # Leer el archivo primero como texto para validar
-                with open(STORE_DATA_FILE, 'r', encoding='utf-8') as f:
-                    raw_content = f.read()
-                    print("Contenido crudo del archivo:", raw_content[:100])  # Mostrar solo parte para debug
-                    
-                    # Verificar si contiene texto ruso/corrupto
-                    if "Какой" in raw_content or "этаж" in raw_content:
-                        raise ValueError("Archivo corrupto - Contiene texto en ruso")
-                    
-                    data = json.loads(raw_content)
-                    
-                    # Validar estructura básica
-                    if not isinstance(data, dict):
-                        raise ValueError("El archivo JSON no contiene un objeto válido")
-                    
-                    # Validar puntos
-                    points = data.get('points', 0)
-                    if not isinstance(points, (int, float)):
-                        raise ValueError("Los puntos deben ser numéricos")
-                    
-                    # Validar skins
-                    skins = data.get('skins', [])
-                    if not isinstance(skins, list):
-                        raise ValueError("Las skins deben estar en una lista")
-                    
-                    # Validar cada skin
-                    validated_skins = []
-                    for skin in skins:
-                        if (isinstance(skin, list) and len(skin)) == 5:
-                            validated_skins.append(skin)
-                        else:
-                            print(f"Skin inválida ignorada: {skin}")
-                    
-                    self.points = points
-                    self.available_skins = validated_skins or default_skins
-            else:
-                print("Creando datos de tienda por defecto")
-                self.available_skins = default_skins
-                self.points = 0
-                
-        except Exception as e:
-            print(f"ERROR cargando datos de tienda: {e}")
-            print("Usando datos por defecto")
-            self.available_skins = default_skins
-            self.points = 0
-        
-        # Forzar guardado para reparar archivo corrupto si es necesario
-        self.save_store_data()
-        self.skin_manager._load_skins()
-
-
     def save_store_data(self):
-        """Guarda los datos de forma segura"""
+        """Guarda la instantánea completa y vacía el diario"""
         import json
-        import tempfile
-        
-        data = {
-            'points': self.points,
-            'skins': self.available_skins
-        }
-        
         try:
-            # Guardar primero en archivo temporal
-            temp_path = os.path.join(STORE_FOLDER, 'temp_store_data.json')
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            
-            # Verificar que el archivo temporal es válido
-            with open(temp_path, 'r', encoding='utf-8') as f:
-                json.load(f)  # Validar que se puede leer
-            
-            # Reemplazar el archivo original
-            if os.path.exists(STORE_DATA_FILE):
-                os.remove(STORE_DATA_FILE)
-            os.rename(temp_path, STORE_DATA_FILE)
-            
+            self.catalog.save()
         except Exception as e:
             print(f"ERROR crítico guardando datos: {e}")
             # Intentar guardar en archivo alternativo
             backup_path = os.path.join(STORE_FOLDER, 'backup_store_data.json')
             try:
                 with open(backup_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f)
+                    json.dump(self.catalog.snapshot(), f)
                 print(f"Datos guardados en archivo de respaldo: {backup_path}")
             except Exception as backup_e:
                 print(f"ERROR en respaldo: {backup_e}")
@@ -165,26 +102,124 @@ class StoreManager:
     def add_points(self, points):
         """Añade puntos al total del jugador."""
         # TODO: Sumar puntos y guardar el nuevo total
-        self.points += points
-        self.save_store_data()
+        self.catalog.add_points(points)
 
     def purchase_skin(self, skin_num):
         """Intenta comprar una skin por su número."""
-        # TODO: Buscar la skin por número y verificar si se puede comprar
-        for i, (num, preview, game, cost, unlocked) in enumerate(self.available_skins):
-            if num == skin_num and not unlocked and self.points >= cost:
-                # TODO: Marcar la skin como desbloqueada y restar puntos
-                self.available_skins[i] = (num, preview, game, cost, True)
-                self.points -= cost
-                self.save_store_data()
-                # TODO: Actualizar SkinManager para incluir la nueva skin
-                self.skin_manager._load_skins()
-                return True
-        # TODO: Retornar False si no se pudo comprar
-        return False
+        # SkinManager y el menú abierto se actualizan con la notificación del catálogo
+        return self.catalog.purchase(skin_num)
+
+    def _on_catalog_change(self, event, data):
+        """Actualiza solo los widgets afectados del menú de la tienda."""
+        menu = self._menu
+        if menu is None:
+            return
+        if event == 'points':
+            menu.get_widget('store_points').set_title(f"Puntos: {data}")
+        elif event == 'unlocked' and data[0] in self._slots:
+            self._bind_slot(self._slots.index(data[0]), data)
+
+    def show_message(self, text, color):
+        """Mensaje temporal bajo las skins (compra exitosa o puntos insuficientes)."""
+        if self._menu is None:
+            return
+        label = self._menu.get_widget('store_message')
+        label.update_font({'color': color})
+        label.set_title(text)
+        self._message_until = time.time() + MESSAGE_SECONDS
+
+    # --- Miniaturas asíncronas ---
+    def _placeholder_image(self):
+        if self._placeholder is None:
+            self._placeholder = pygame.Surface(PREVIEW_SIZE, pygame.SRCALPHA)
+            pygame.draw.rect(self._placeholder, (100, 100, 100), (0, 0, *PREVIEW_SIZE))
+        return self._placeholder
+
+    def _thumbnail(self, preview_file):
+        """Miniatura ya lista, o None si se está cargando (la carga se pide en segundo plano)."""
+        image = self.skin_manager.skin_cache.peek(preview_file, PREVIEW_SIZE)
+        if image is None and preview_file not in self._thumb_jobs:
+            if self._thumb_pool is None:
+                self._thumb_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='store-thumbs')
+            self._thumb_jobs[preview_file] = self._thumb_pool.submit(
+                self.skin_manager.skin_cache.read, preview_file, PREVIEW_SIZE)
+        return image
+
+    def _deliver_thumbnails(self):
+        # La conversión y el escalado usan la pantalla: se hacen en el hilo principal
+        for preview_file, future in list(self._thumb_jobs.items()):
+            if not future.done():
+                continue
+            del self._thumb_jobs[preview_file]
+            try:
+                mtime, image = future.result()
+                thumb = self.skin_manager.skin_cache.add(preview_file, PREVIEW_SIZE, image, mtime)
+            except Exception as e:
+                print(f"Error cargando vista previa {preview_file}: {e}")
+                continue
+            for slot, num in enumerate(self._slots):
+                skin = self.catalog.get(num) if num is not None else None
+                if skin is not None and skin[1] == preview_file:
+                    self._menu.get_widget(f'slot_{slot}_preview').set_surface(thumb)
+
+    def _on_menu_update(self, events, menu):
+        self._deliver_thumbnails()
+        if self._message_until and time.time() > self._message_until:
+            self._message_until = 0
+            menu.get_widget('store_message').set_title('')
+
+    # --- Páginas ---
+    def _bind_slot(self, slot, skin):
+        """Muestra skin en la casilla slot (o la oculta si skin es None)."""
+        menu = self._menu
+        frame = menu.get_widget(f'slot_{slot}_frame')
+        self._slots[slot] = skin[0] if skin else None
+        if skin is None:
+            frame.hide()
+            return
+        num, preview_file, game_file, cost, unlocked = skin
+        frame.show()
+        menu.get_widget(f'slot_{slot}_preview').set_surface(
+            self._thumbnail(preview_file) or self._placeholder_image())
+        status = "Desbloqueado" if unlocked else f"Costo: {cost} puntos"
+        menu.get_widget(f'slot_{slot}_status').set_title(f"Skin {num} - {status}")
+        buy_button = menu.get_widget(f'slot_{slot}_buy')
+        buy_button.update_callback(create_buy_button(self, num))
+        if unlocked:
+            buy_button.hide()
+        else:
+            buy_button.show()
+
+    def _show_page(self, page):
+        skins = self.available_skins
+        pages = max(1, -(-len(skins) // STORE_PAGE_SIZE))
+        self._page = page % pages
+        start = self._page * STORE_PAGE_SIZE
+        for slot in range(STORE_PAGE_SIZE):
+            index = start + slot
+            self._bind_slot(slot, skins[index] if index < len(skins) else None)
+        self._menu.get_widget('store_page').set_title(f"Pagina {self._page + 1} de {pages}")
+        # Adelanta la carga de las miniaturas de la página siguiente
+        for skin in skins[start + STORE_PAGE_SIZE:start + 2 * STORE_PAGE_SIZE]:
+            self._thumbnail(skin[1])
 
     def create_store_menu(self, surface, on_return):
-        """Crea el menú de la tienda con skins en disposición horizontal."""
+        """
+        Devuelve el menú de la tienda. Se construye una sola vez con STORE_PAGE_SIZE
+        casillas que se reutilizan al cambiar de página; las miniaturas llegan en segundo plano.
+        """
+        if self._menu is None:
+            self._menu = self._build_store_menu()
+        menu = self._menu
+        menu.set_onclose(on_return)
+        if not menu.is_enabled():
+            menu.enable()  # Al cerrarse con Regresar el menú queda deshabilitado
+        menu.get_widget('store_points').set_title(f"Puntos: {self.points}")
+        self._show_page(self._page)
+        return menu
+
+    def _build_store_menu(self):
+        """Crea el menú de la tienda con las casillas de skins en disposición horizontal."""
         # TODO: Configurar el tema del menú con estilo retro
         theme = themes.THEME_DARK.copy()
         theme.title_font = pygame_menu.font.FONT_8BIT
@@ -204,11 +239,13 @@ class StoreManager:
             width=self.width,
             height=self.height,
             theme=theme,
-            onclose=on_return
+            onclose=pygame_menu.events.CLOSE
         )
+        menu.set_onupdate(self._on_menu_update)
+        menu.disable_render()  # Se calcula la disposición una sola vez, al final
 
         # TODO: Mostrar los puntos actuales del jugador
-        menu.add.label(f"Puntos: {self.points}", font_size=20)
+        menu.add.label(f"Puntos: {self.points}", font_size=20, label_id='store_points')
         menu.add.vertical_margin(20)
 
         # TODO: Crear un frame horizontal para alinear las skins
@@ -221,44 +258,39 @@ class StoreManager:
         skin_frame._relax = True  # TODO: Relajar restricciones de tamaño para evitar excepciones
         skin_frame.pack(menu.add.horizontal_margin(10), align=pygame_menu.locals.ALIGN_LEFT)
 
-        # TODO: Iterar sobre cada skin para crear su sección
-# En create_store_menu de tienda.py
-        for num, preview_file, game_file, cost, unlocked in self.available_skins:
+        # Casillas vacías; _show_page les asigna las skins de la página actual
+        for slot in range(STORE_PAGE_SIZE):
             item_frame = skin_frame.pack(
-                menu.add.frame_v(width=200, height=280, frame_id=f'skin_{num}_frame'),
+                menu.add.frame_v(width=180, height=280, frame_id=f'slot_{slot}_frame'),
                 align=pygame_menu.locals.ALIGN_CENTER
             )
+            item_frame._relax = True
             # Vista previa
-            preview_path = os.path.join(SKIN_FOLDER, preview_file)
-            try:
-                if not os.path.exists(preview_path):
-                    raise FileNotFoundError(f"No file '{preview_path}'")
-                preview_surf = pygame.image.load(preview_path).convert_alpha()
-                scaled_preview = pygame.transform.scale(preview_surf, (100, 100))
-                item_frame.pack(menu.add.surface(scaled_preview), align=pygame_menu.locals.ALIGN_CENTER)
-            except Exception as e:
-                print(f"Error cargando vista previa de skin {num}: {e}")
-                fallback = pygame.Surface((100, 100), pygame.SRCALPHA)
-                pygame.draw.rect(fallback, (100, 100, 100), (0, 0, 100, 100))
-                item_frame.pack(menu.add.surface(fallback), align=pygame_menu.locals.ALIGN_CENTER)
+            item_frame.pack(menu.add.surface(self._placeholder_image(), surface_id=f'slot_{slot}_preview'),
+                            align=pygame_menu.locals.ALIGN_CENTER)
             # Estado
-            status = "Desbloqueado" if unlocked else f"Costo: {cost} puntos"
-            label_widget = menu.add.label(f"Skin {num} - {status}", font_size=14)
-            label_widget.set_max_width(180)
+            label_widget = menu.add.label("", font_size=14, label_id=f'slot_{slot}_status')
+            label_widget.set_max_width(170)
             item_frame.pack(label_widget, align=pygame_menu.locals.ALIGN_CENTER)
             # Botón Comprar
-            if not unlocked:
-                buy_button = menu.add.button(
-                    'Comprar',
-                    create_buy_button(self, num, menu),
-                    font_size=16
-                )
-                buy_button.set_background_color((255, 165, 0))
-                item_frame.pack(buy_button, align=pygame_menu.locals.ALIGN_CENTER)
+            buy_button = menu.add.button('Comprar', lambda: None, font_size=16, button_id=f'slot_{slot}_buy')
+            buy_button.set_background_color((255, 165, 0))
+            item_frame.pack(buy_button, align=pygame_menu.locals.ALIGN_CENTER)
 
             # TODO: Agregar margen entre ítems para mejor separación
             skin_frame.pack(menu.add.horizontal_margin(10), align=pygame_menu.locals.ALIGN_LEFT)
 
+        # Paginación
+        page_frame = menu.add.frame_h(width=500, height=50, frame_id='page_frame')
+        page_frame._relax = True
+        page_frame.pack(menu.add.button('Anterior', lambda: self._show_page(self._page - 1), font_size=16))
+        page_frame.pack(menu.add.label("", font_size=16, label_id='store_page'), align=pygame_menu.locals.ALIGN_CENTER)
+        page_frame.pack(menu.add.button('Siguiente', lambda: self._show_page(self._page + 1), font_size=16),
+                        align=pygame_menu.locals.ALIGN_RIGHT)
+        menu.add.label("", font_size=18, label_id='store_message')
+
         # TODO: Agregar botón Regresar para volver al menú principal
         menu.add.button('Regresar', create_return_button(menu))
-        return menu
\ No newline at end of file
+        menu.enable_render()
+        menu.render()
+        return menu